@@ -0,0 +1,157 @@
+
+# Scenario
+# "FHE bank.py" hard-codes poly_modulus_degree = 8192, coeff_mod_bit_sizes = [60, 40, 40, 60] and global_scale = 2**40.
+# Smaller parameters make every encryption, operation and decryption cheaper, but too small a scale loses precision
+# and too few modulus bits overflow. This tool measures candidate parameter sets on the net-salary computation and
+# picks the cheapest one that meets a required absolute precision at a required security level.
+
+# Usage:
+# python "CKKS parameter tuner.py" --precision 0.05 --security 128
+# python "CKKS parameter tuner.py" --precision 1 --security 192 --output tuning.json
+
+
+
+
+# Step 1: Loads the libraries
+import argparse # For command-line options
+import importlib.util # For loading the payroll module from its file
+import json # For machine-readable results
+import math # For bit-size arithmetic
+import os # For locating the payroll module
+import sys # For registering the loaded module
+import time # For timing each stage
+import tenseal as ts # For HE system
+import numpy as np # For the sample workload
+
+
+
+
+# Step 2: Loads the payroll engine from "FHE bank.py", the same way "blockchain benchmark.py" loads the ledger
+def load_payroll_module():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "FHE bank.py")
+    spec = importlib.util.spec_from_file_location("fhe_bank", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+payroll = load_payroll_module()
+
+
+
+
+# Step 3: Defines the candidate parameter sets
+
+# Largest total coeff_mod_bit_sizes per poly_modulus_degree at each security level (HomomorphicEncryption.org standard, as used by SEAL)
+MAX_COEFF_MODULUS_BITS = {
+    128: {4096: 109, 8192: 218, 16384: 438, 32768: 881},
+    192: {4096: 75, 8192: 152, 16384: 305, 32768: 611},
+    256: {4096: 58, 8192: 118, 16384: 237, 32768: 476},
+}
+MAX_PRIME_BITS = 60 # SEAL's limit for a single coefficient modulus prime
+
+def candidate_parameters(degrees, scale_bits_options, depth, value_bits, security_level):
+    # Builds [outer, scale x depth, special] modulus chains; the outer prime must hold the value bits on top of the scale
+    candidates = []
+    for poly_modulus_degree in degrees:
+        for scale_bits in scale_bits_options:
+            outer_bits = scale_bits + value_bits
+            if outer_bits > MAX_PRIME_BITS:
+                continue
+            coeff_mod_bit_sizes = [outer_bits] + [scale_bits] * depth + [outer_bits]
+            if sum(coeff_mod_bit_sizes) > MAX_COEFF_MODULUS_BITS[security_level][poly_modulus_degree]:
+                continue
+            candidates.append({"poly_modulus_degree": poly_modulus_degree, "coeff_mod_bit_sizes": coeff_mod_bit_sizes, "scale_bits": scale_bits})
+    return candidates
+
+
+
+
+# Step 4: Measures one parameter set on the net-salary computation
+def sample_workload(employees, seed = 0):
+    # Random salaries, bonuses and deductions in the same ranges as the payroll demo
+    rng = np.random.default_rng(seed)
+    return rng.integers(30000, 350000, employees).astype(float), rng.integers(0, 80000, employees).astype(float), rng.integers(1000, 8000, employees).astype(float)
+
+def measure_candidate(candidate, salaries, bonuses, deductions, tax_rate):
+    # Returns per-employee encrypt/compute/decrypt latency, ciphertext size and the maximum absolute error
+    context = ts.context(ts.SCHEME_TYPE.CKKS, poly_modulus_degree = candidate["poly_modulus_degree"], coeff_mod_bit_sizes = candidate["coeff_mod_bit_sizes"])
+    context.global_scale = 2 ** candidate["scale_bits"]
+    slot_count = candidate["poly_modulus_degree"] // 2
+    expected = payroll.compute_net_salary(salaries, bonuses, deductions, tax_rate) # Same formula on plaintext arrays
+    timings = {"encrypt": 0.0, "compute": 0.0, "decrypt": 0.0}
+    max_error = 0.0
+    ciphertext_bytes = 0
+    for start in range(0, len(salaries), slot_count):
+        chunk = slice(start, start + slot_count)
+        start_time = time.perf_counter()
+        encrypted = [ts.ckks_vector(context, values[chunk].tolist()) for values in (salaries, bonuses, deductions)]
+        timings["encrypt"] += time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        enc_net_salary = payroll.compute_net_salary(*encrypted, tax_rate)
+        timings["compute"] += time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        net_salary = np.array(enc_net_salary.decrypt())
+        timings["decrypt"] += time.perf_counter() - start_time
+        max_error = max(max_error, float(np.abs(net_salary - expected[chunk]).max()))
+        ciphertext_bytes += sum(len(enc_vector.serialize()) for enc_vector in encrypted)
+    employees = len(salaries)
+    result = dict(candidate)
+    result.update({f"{stage}_us_per_employee": seconds / employees * 1e6 for stage, seconds in timings.items()})
+    result["total_us_per_employee"] = sum(timings.values()) / employees * 1e6
+    result["ciphertext_bytes_per_employee"] = ciphertext_bytes / employees
+    result["max_abs_error"] = max_error
+    return result
+
+
+
+
+# Step 5: Picks the cheapest parameter set that meets the precision target
+def tune(precision, security_level, employees = 8192, tax_rate = 0.40, degrees = (4096, 8192, 16384), scale_bits_options = range(20, 56, 5), depth = 1):
+    # The net-salary formula multiplies once (by the tax rate), so it needs one rescaling level (depth = 1)
+    salaries, bonuses, deductions = sample_workload(employees)
+    largest_value = max(np.abs(values).max() for values in (salaries + bonuses, payroll.compute_net_salary(salaries, bonuses, deductions, tax_rate)))
+    value_bits = math.ceil(math.log2(largest_value)) + 1 # One extra bit for the sign
+    results = []
+    for candidate in candidate_parameters(degrees, scale_bits_options, depth, value_bits, security_level):
+        try:
+            result = measure_candidate(candidate, salaries, bonuses, deductions, tax_rate)
+        except ValueError as error: # SEAL rejects moduli it cannot find primes for
+            result = dict(candidate, error = str(error))
+        result["meets_precision"] = result.get("max_abs_error", math.inf) <= precision
+        results.append(result)
+    passing = [result for result in results if result["meets_precision"]]
+    best = min(passing, key = lambda result: result["total_us_per_employee"]) if passing else None
+    return best, results
+
+def main():
+    parser = argparse.ArgumentParser(description = "Choose CKKS parameters for the payroll computation.")
+    parser.add_argument("--precision", type = float, default = 0.05, help = "Required maximum absolute error in net salary")
+    parser.add_argument("--security", type = int, choices = sorted(MAX_COEFF_MODULUS_BITS), default = 128, help = "Required security level in bits")
+    parser.add_argument("--employees", type = int, default = 8192, help = "Sample size used for the measurements")
+    parser.add_argument("--output", help = "File to write the JSON results to")
+    args = parser.parse_args()
+
+    best, results = tune(args.precision, args.security, args.employees)
+
+    print(f"{'N':>6} {'coeff_mod_bit_sizes':<22} {'scale':>5} {'enc us':>8} {'comp us':>8} {'dec us':>8} {'bytes':>8} {'max error':>12}")
+    for result in results:
+        if "error" in result:
+            print(f"{result['poly_modulus_degree']:>6} {str(result['coeff_mod_bit_sizes']):<22} {result['scale_bits']:>5}  rejected: {result['error']}")
+            continue
+        print(f"{result['poly_modulus_degree']:>6} {str(result['coeff_mod_bit_sizes']):<22} {result['scale_bits']:>5} "
+              f"{result['encrypt_us_per_employee']:>8.2f} {result['compute_us_per_employee']:>8.2f} {result['decrypt_us_per_employee']:>8.2f} "
+              f"{result['ciphertext_bytes_per_employee']:>8.1f} {result['max_abs_error']:>12.6f}")
+
+    if best is None:
+        print(f"\nNo candidate meets a precision of {args.precision} at {args.security}-bit security.")
+    else:
+        print(f"\nCheapest set meeting {args.precision} at {args.security}-bit security: poly_modulus_degree = {best['poly_modulus_degree']}, "
+              f"coeff_mod_bit_sizes = {best['coeff_mod_bit_sizes']}, global_scale = 2**{best['scale_bits']}")
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump({"precision": args.precision, "security": args.security, "best": best, "results": results}, output_file, indent = 2)
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,15 @@
 
 
 # Step 1: Loads the libraries
+import argparse # For the key store command-line options
+import csv # For streaming employee records from payroll files
+import hashlib # For key store integrity checks
+import collections # For the pipeline's window of in-flight chunks
+import json # For the key store manifest
+import multiprocessing # For the parallel encryption and compute stages
+import os # For file paths
+import tempfile # For the sample workforce file
+import time # For key store timestamps and pipeline timing
 import tenseal as ts # For HE system
 import matplotlib.pyplot as plt # For plotting graph 
 import numpy as np # For random number generator 
@@ -30,96 +39,358 @@ import numpy as np # For random number generator
 
 
 # Step 2: Creates a context for encryption
-context = ts.context(
-    scheme = ts.SCHEME_TYPE.CKKS, # Using CKKS scheme for floating-point operations
-    poly_modulus_degree = 8192, # Defines the security level
-    coeff_mod_bit_sizes = [60, 40, 40, 60]  # Encryption parameters
-)
 
-# Enables necessary functionalities
-context.global_scale = 2**40  # Scaling factor for precision
-context.generate_galois_keys()  # Enables rotation operations
-context.generate_relin_keys()   # Enables multiplication operations
+# Encryption parameters
+POLY_MODULUS_DEGREE = 8192 # Defines the security level
+COEFF_MOD_BIT_SIZES = [60, 40, 40, 60] # Encryption parameters
+GLOBAL_SCALE = 2**40 # Scaling factor for precision
+SLOT_COUNT = POLY_MODULUS_DEGREE // 2 # Values packed into one CKKS ciphertext
+
+def create_context():
+    context = ts.context(
+        scheme = ts.SCHEME_TYPE.CKKS, # Using CKKS scheme for floating-point operations
+        poly_modulus_degree = POLY_MODULUS_DEGREE,
+        coeff_mod_bit_sizes = COEFF_MOD_BIT_SIZES
+    )
+
+    # Enables necessary functionalities
+    context.global_scale = GLOBAL_SCALE
+    context.generate_galois_keys()  # Enables rotation operations
+    context.generate_relin_keys()   # Enables multiplication operations
+    return context
+
+
+
+
+# Serialized context and key store
+# The context is generated once and saved in two variants: a secret-bearing one for the key holder, and a public-only one
+# (public, Galois and relinearization keys) for the server computing on ciphertexts. A manifest records the encryption
+# parameters and a SHA-256 digest of each file, so a corrupted file or a parameter change is caught before use.
+DEFAULT_KEY_STORE = os.path.expanduser("~/.fhe_bank_keys")
+KEY_STORE_FILES = {"secret": "context_secret.bin", "public": "context_public.bin"}
+KEY_STORE_MANIFEST = "manifest.json"
+
+def context_parameters():
+    # Parameters a stored context must match to be reused
+    return {"poly_modulus_degree": POLY_MODULUS_DEGREE, "coeff_mod_bit_sizes": COEFF_MOD_BIT_SIZES, "global_scale": GLOBAL_SCALE}
+
+def write_file_atomically(path, data, mode = 0o600):
+    # Writes to a temporary file first so a crash never leaves a half-written key file behind
+    temporary_path = path + ".tmp"
+    with open(os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode), "wb") as key_file:
+        key_file.write(data)
+    os.replace(temporary_path, path)
+
+def save_context_store(context, directory = DEFAULT_KEY_STORE):
+    # Serializes the secret and public-only variants of the context and writes the manifest last
+    os.makedirs(directory, mode = 0o700, exist_ok = True)
+    public_context = context.copy()
+    public_context.make_context_public()
+    blobs = {"secret": context.serialize(save_secret_key = True), "public": public_context.serialize()}
+    manifest = {"parameters": context_parameters(), "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "files": {}}
+    for variant, blob in blobs.items():
+        write_file_atomically(os.path.join(directory, KEY_STORE_FILES[variant]), blob)
+        manifest["files"][variant] = {"name": KEY_STORE_FILES[variant], "sha256": hashlib.sha256(blob).hexdigest()}
+    write_file_atomically(os.path.join(directory, KEY_STORE_MANIFEST), json.dumps(manifest, indent = 2).encode())
+
+def load_context_store(directory = DEFAULT_KEY_STORE, variant = "secret"):
+    # Loads the "secret" or "public" context; raises ValueError if it fails its integrity or parameter checks
+    with open(os.path.join(directory, KEY_STORE_MANIFEST)) as manifest_file:
+        manifest = json.load(manifest_file)
+    if manifest["parameters"] != context_parameters():
+        raise ValueError(f"Key store {directory} was created with different encryption parameters; rotate it")
+    entry = manifest["files"][variant]
+    try:
+        with open(os.path.join(directory, entry["name"]), "rb") as key_file:
+            data = key_file.read()
+    except FileNotFoundError:
+        raise ValueError(f"Key store file {entry['name']} is listed in the manifest but missing") from None
+    if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+        raise ValueError(f"Key store file {entry['name']} failed its integrity check")
+    return ts.context_from(data)
+
+def load_or_create_context(directory = DEFAULT_KEY_STORE):
+    # Reuses the stored secret context, generating and saving a new one on the first run (no manifest yet).
+    # A store whose manifest lists missing files is damaged, not new, so it raises instead of replacing the keys
+    if not os.path.exists(os.path.join(directory, KEY_STORE_MANIFEST)):
+        context = create_context()
+        save_context_store(context, directory)
+        return context
+    return load_context_store(directory, "secret")
+
+def rotate_context_store(directory = DEFAULT_KEY_STORE):
+    # Replaces the stored keys with freshly generated ones; ciphertexts under the old keys can no longer be decrypted
+    context = create_context()
+    save_context_store(context, directory)
+    return context
+
+
+
+
+# Slot-packed payroll engine for large workforces
+# Employee records are streamed from a CSV file (employee_id, salary, bonus, deduction) in chunks of SLOT_COUNT,
+# so each ciphertext is full and only one chunk is held in memory at a time.
+
+def compute_net_salary(enc_salaries, enc_bonuses, enc_deductions, tax_rate):
+    # Net salary = gross salary - tax - deductions, computed on encrypted vectors
+    enc_net_gross_salary = enc_salaries + enc_bonuses
+    enc_net_tax = enc_net_gross_salary * tax_rate
+    return enc_net_gross_salary - enc_net_tax - enc_deductions
+
+def read_payroll_chunks(csv_path, chunk_size = SLOT_COUNT):
+    # Yields (employee_ids, salaries, bonuses, deductions) lists holding at most chunk_size employees
+    with open(csv_path, newline = "") as payroll_file:
+        reader = csv.DictReader(payroll_file)
+        chunk = ([], [], [], [])
+        for row in reader:
+            chunk[0].append(row["employee_id"])
+            chunk[1].append(float(row["salary"]))
+            chunk[2].append(float(row["bonus"]))
+            chunk[3].append(float(row["deduction"]))
+            if len(chunk[0]) == chunk_size:
+                yield chunk
+                chunk = ([], [], [], [])
+        if chunk[0]:
+            yield chunk
+
+def encrypt_payroll_chunk(context, salaries, bonuses, deductions):
+    # Encrypts one chunk into three full-slot CKKS vectors; unused slots hold zero so chunks can be added together
+    padding = [0.0] * (SLOT_COUNT - len(salaries))
+    return ts.ckks_vector(context, salaries + padding), ts.ckks_vector(context, bonuses + padding), ts.ckks_vector(context, deductions + padding)
+
+def run_payroll(context, csv_path, tax_rate, chunk_size = SLOT_COUNT):
+    # Streams the payroll file and yields (employee_ids, encrypted net salaries) one chunk at a time
+    for employee_ids, salaries, bonuses, deductions in read_payroll_chunks(csv_path, chunk_size):
+        enc_salaries, enc_bonuses, enc_deductions = encrypt_payroll_chunk(context, salaries, bonuses, deductions)
+        yield employee_ids, compute_net_salary(enc_salaries, enc_bonuses, enc_deductions, tax_rate)
+
+def write_net_salaries(payroll_chunks, output_path):
+    # Decrypts each chunk as it arrives and appends the net salaries to a CSV file; returns the employee count
+    employees = 0
+    with open(output_path, "w", newline = "") as output_file:
+        writer = csv.writer(output_file)
+        writer.writerow(["employee_id", "net_salary"])
+        for employee_ids, enc_net_salary in payroll_chunks:
+            writer.writerows(zip(employee_ids, (round(value, 2) for value in enc_net_salary.decrypt())))
+            employees += len(employee_ids)
+    return employees
+
+def encrypted_payroll_total(payroll_chunks, context = None):
+    # Adds the chunk ciphertexts slot-wise, then sums across slots with rotate-and-add (log2(SLOT_COUNT) rotations
+    # using the Galois keys); returns the encrypted total and the employee count.
+    # A payroll file with no employees totals to an encryption of zero, which needs the context.
+    enc_accumulator = None
+    employees = 0
+    for employee_ids, enc_net_salary in payroll_chunks:
+        if enc_accumulator is None:
+            enc_accumulator = enc_net_salary
+        else:
+            enc_accumulator += enc_net_salary
+        employees += len(employee_ids)
+    if enc_accumulator is None:
+        if context is None:
+            raise ValueError("No employees in the payroll; pass the context to encrypt a zero total")
+        return ts.ckks_vector(context, [0.0]), 0
+    return enc_accumulator.sum(), employees
+
+def encrypted_payroll_report(context, csv_path, tax_rate, include_mean = True):
+    # Computes the encrypted total payroll (and optionally the encrypted mean) without decrypting any employee's salary.
+    # The mean of an empty payroll is undefined, so it is None when there are no employees.
+    enc_total, employees = encrypted_payroll_total(run_payroll(context, csv_path, tax_rate), context)
+    enc_mean = enc_total * (1 / employees) if include_mean and employees else None
+    return enc_total, enc_mean, employees
+
+def write_sample_workforce(csv_path, employees, seed = 0):
+    # Writes a random workforce file for demos and benchmarks
+    rng = np.random.default_rng(seed)
+    with open(csv_path, "w", newline = "") as payroll_file:
+        writer = csv.writer(payroll_file)
+        writer.writerow(["employee_id", "salary", "bonus", "deduction"])
+        for start in range(0, employees, SLOT_COUNT):
+            count = min(SLOT_COUNT, employees - start)
+            salaries = rng.integers(30000, 350000, count)
+            bonuses = rng.integers(0, 80000, count)
+            deductions = rng.integers(1000, 8000, count)
+            writer.writerows(zip(range(start, start + count), salaries, bonuses, deductions))
+
+
+
+
+# Parallel encryption/compute/decryption pipeline
+# The data owner's encryption workers and the compute server's workers each load a serialized public-only context,
+# and chunks travel between the stages as serialized ciphertexts. Only the final decrypt stage holds the secret key.
+_pipeline_context = None # Context loaded once in each pool worker
+
+def public_context_bytes(context, with_galois_keys = False):
+    # Serializes a copy of the context without the secret key; Galois keys are only needed for rotations
+    public_context = context.copy()
+    public_context.make_context_public()
+    return public_context.serialize(save_galois_keys = with_galois_keys)
+
+def _init_pipeline_worker(serialized_context):
+    global _pipeline_context
+    _pipeline_context = ts.context_from(serialized_context)
+
+def _encrypt_chunk_job(chunk):
+    # Encryption stage: plaintext chunk -> serialized salary, bonus and deduction ciphertexts
+    employee_ids, salaries, bonuses, deductions = chunk
+    encrypted = encrypt_payroll_chunk(_pipeline_context, salaries, bonuses, deductions)
+    return employee_ids, [enc_vector.serialize() for enc_vector in encrypted]
+
+def _compute_chunk_job(job):
+    # Compute stage: serialized input ciphertexts -> serialized net salary ciphertext
+    employee_ids, serialized_inputs, tax_rate = job
+    enc_salaries, enc_bonuses, enc_deductions = (ts.ckks_vector_from(_pipeline_context, data) for data in serialized_inputs)
+    return employee_ids, compute_net_salary(enc_salaries, enc_bonuses, enc_deductions, tax_rate).serialize()
+
+def bounded_imap(pool, function, items, window):
+    # Like Pool.imap, but never has more than `window` items in flight, so a huge input is never read ahead
+    in_flight = collections.deque()
+    for item in items:
+        in_flight.append(pool.apply_async(function, (item,)))
+        if len(in_flight) >= window:
+            yield in_flight.popleft().get()
+    while in_flight:
+        yield in_flight.popleft().get()
 
+def run_payroll_pipeline(context, csv_path, tax_rate, workers = None, chunk_size = SLOT_COUNT):
+    # Yields (employee_ids, net salary vector bound to the secret context), like run_payroll but with the encryption
+    # and compute stages running in parallel on separate process pools
+    workers = workers or os.cpu_count() or 1
+    window = 2 * workers # Chunks in flight per stage
+    serialized_public_context = public_context_bytes(context)
+    process_context = multiprocessing.get_context()
+    with process_context.Pool(workers, initializer = _init_pipeline_worker, initargs = (serialized_public_context,)) as encrypt_pool, \
+         process_context.Pool(workers, initializer = _init_pipeline_worker, initargs = (serialized_public_context,)) as compute_pool:
+        encrypted_chunks = bounded_imap(encrypt_pool, _encrypt_chunk_job, read_payroll_chunks(csv_path, chunk_size), window)
+        compute_jobs = ((employee_ids, serialized_inputs, tax_rate) for employee_ids, serialized_inputs in encrypted_chunks)
+        for employee_ids, serialized_net_salary in bounded_imap(compute_pool, _compute_chunk_job, compute_jobs, window):
+            yield employee_ids, ts.ckks_vector_from(context, serialized_net_salary) # Decrypt stage
 
 
 
-# Step 3: Encrypts employee salaries and other important data
+if __name__ == "__main__":
 
-# Employees salaries
-salaries = [60000, 55000, 70000, 80000, 90000, 120000, 350000, 100000, 200000, 85000]  # Employee salaries
-print("Salaries: ", salaries) # Prints the salaries
+    parser = argparse.ArgumentParser(description = "Secure payroll computation with CKKS homomorphic encryption.")
+    parser.add_argument("--key-store", default = DEFAULT_KEY_STORE, help = "Directory holding the serialized context and keys")
+    parser.add_argument("--rotate-keys", action = "store_true", help = "Generate new keys, replace the stored ones and exit")
+    args = parser.parse_args()
 
-# Employees bonuses
-bonuses = [4000, 3000, 7000, 5000, 10000, 80000, 2000, 6000, 7500, 9000]  # Performance bonuses
-print("Bonuses: ", bonuses) # Prints the bonus
+    if args.rotate_keys:
+        rotate_context_store(args.key_store)
+        print(f"Rotated the keys in {args.key_store}")
+        raise SystemExit
 
-# Tax rate
-tax_rate = 0.40  # 40% tax
-print("Tax rate: ", tax_rate) # Prints the tax rate
+    # Loads the context and keys from the key store (generated and saved on the first run)
+    context = load_or_create_context(args.key_store)
 
-# Employees deductions (healthcare, insurance, pension)
-deductions = [3000, 4000, 2000, 1000, 3000, 5000, 7000, 6000, 8000, 2500]  # Healthcare, insurance, pension
-print("Deductions: ", deductions) # Prints the deductions
 
-# Encrypt the salary, bonus, deductions
 
-# Encrypted employees salaries
-enc_salaries = ts.ckks_vector(context, salaries) # Encrypted salary
-print("Encrypted salaries: ", enc_salaries) # Prints the encrypted salaries
 
-# Encrypted employees bonuses
-enc_bonuses = ts.ckks_vector(context, bonuses) # Encrypted bonuses
-print("Encrypted bonuses: ", enc_bonuses) # Prints the encrypted bonuses
+    # Step 3: Encrypts employee salaries and other important data
 
-# Encrypted employees deductions (healthcare, insurance, pension)
-enc_deductions = ts.ckks_vector(context, deductions) # Encrypted deductions
-print("Encrypted deductions: ", enc_deductions) # Prints the encrypted deductions
+    # Employees salaries
+    salaries = [60000, 55000, 70000, 80000, 90000, 120000, 350000, 100000, 200000, 85000]  # Employee salaries
+    print("Salaries: ", salaries) # Prints the salaries
 
+    # Employees bonuses
+    bonuses = [4000, 3000, 7000, 5000, 10000, 80000, 2000, 6000, 7500, 9000]  # Performance bonuses
+    print("Bonuses: ", bonuses) # Prints the bonus
 
+    # Tax rate
+    tax_rate = 0.40  # 40% tax
+    print("Tax rate: ", tax_rate) # Prints the tax rate
 
+    # Employees deductions (healthcare, insurance, pension)
+    deductions = [3000, 4000, 2000, 1000, 3000, 5000, 7000, 6000, 8000, 2500]  # Healthcare, insurance, pension
+    print("Deductions: ", deductions) # Prints the deductions
 
-# Step 4: Performs secure payroll computation (aggregate employees' salaries)
+    # Encrypt the salary, bonus, deductions
 
-# Net encrypted gross salary 
-enc_net_gross_salary = enc_salaries + enc_bonuses  # Computes net gross salary
-print("Encrypted net employee gross salary: ", enc_net_gross_salary) # Prints the encrypted salaries
+    # Encrypted employees salaries
+    enc_salaries = ts.ckks_vector(context, salaries) # Encrypted salary
+    print("Encrypted salaries: ", enc_salaries) # Prints the encrypted salaries
 
-# Net encrypted tax
-enc_net_tax = enc_net_gross_salary * tax_rate  # Computes net tax
-print("Encrypted net tax: ", enc_net_tax) # Prints the encrypted salaries
+    # Encrypted employees bonuses
+    enc_bonuses = ts.ckks_vector(context, bonuses) # Encrypted bonuses
+    print("Encrypted bonuses: ", enc_bonuses) # Prints the encrypted bonuses
 
-# Net encrypted salary
-enc_net_salary = enc_net_gross_salary - enc_net_tax - enc_deductions  # Computes net salary
-print("Encrypted net employee salary: ", enc_net_salary) # Prints the encrypted net salaries
+    # Encrypted employees deductions (healthcare, insurance, pension)
+    enc_deductions = ts.ckks_vector(context, deductions) # Encrypted deductions
+    print("Encrypted deductions: ", enc_deductions) # Prints the encrypted deductions
 
 
 
 
-# Step 5: Decrypts and retrieves the result
+    # Step 4: Performs secure payroll computation (aggregate employees' salaries)
 
-# Net decrypted salary
-dec_net_salary = enc_net_salary.decrypt() # Decrypts net employee salary
-print("Decrypted net employee salary: ", dec_net_salary) # Prints the decrypted net employee salaries
+    # Net encrypted gross salary 
+    enc_net_gross_salary = enc_salaries + enc_bonuses  # Computes net gross salary
+    print("Encrypted net employee gross salary: ", enc_net_gross_salary) # Prints the encrypted salaries
 
+    # Net encrypted tax
+    enc_net_tax = enc_net_gross_salary * tax_rate  # Computes net tax
+    print("Encrypted net tax: ", enc_net_tax) # Prints the encrypted salaries
 
+    # Net encrypted salary
+    enc_net_salary = enc_net_gross_salary - enc_net_tax - enc_deductions  # Computes net salary
+    print("Encrypted net employee salary: ", enc_net_salary) # Prints the encrypted net salaries
 
 
-# Step 6: Graph plot
 
-# Converts decrypted salaries to numpy array for plotting
-dec_net_salary_graph = np.arange(len(dec_net_salary))  # Employee indices
 
-# Plot the decrypted net salaries
-plt.figure(figsize=(10, 5))
-plt.bar(dec_net_salary_graph, dec_net_salary, color="green")
+    # Step 5: Decrypts and retrieves the result
 
-# Labels and title
-plt.xlabel("Employee Index")
-plt.ylabel("Net Salary ($)")
-plt.title("Decrypted Net Salary per Employee")
-plt.xticks(dec_net_salary_graph)  # Set employee indices as x-axis labels
-plt.grid(axis = "y", linestyle = "--", alpha = 0.7)
+    # Net decrypted salary
+    dec_net_salary = enc_net_salary.decrypt() # Decrypts net employee salary
+    print("Decrypted net employee salary: ", dec_net_salary) # Prints the decrypted net employee salaries
 
-# Show the plot
-plt.show()
+
+
+
+    # Step 6: Runs the slot-packed payroll engine over a large workforce file
+
+    # Writes a sample workforce of 20,000 employees and streams it through the engine chunk by chunk
+    workforce_dir = tempfile.mkdtemp()
+    workforce_path = os.path.join(workforce_dir, "workforce.csv")
+    write_sample_workforce(workforce_path, 20000)
+    net_salary_path = os.path.join(workforce_dir, "net_salaries.csv")
+    processed = write_net_salaries(run_payroll(context, workforce_path, tax_rate), net_salary_path)
+    print(f"Processed {processed} employees in {-(-processed // SLOT_COUNT)} ciphertext chunks of {SLOT_COUNT} slots: {net_salary_path}")
+
+    # Runs the same payroll through the parallel pipeline and compares the wall-clock time
+    start_time = time.perf_counter()
+    write_net_salaries(run_payroll(context, workforce_path, tax_rate), net_salary_path)
+    serial_seconds = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    write_net_salaries(run_payroll_pipeline(context, workforce_path, tax_rate), net_salary_path)
+    pipeline_seconds = time.perf_counter() - start_time
+    print(f"Serial engine: {serial_seconds:.2f}s, pipeline on {os.cpu_count()} cores: {pipeline_seconds:.2f}s")
+
+    # Aggregates the whole workforce homomorphically so only the total and the mean are ever decrypted
+    enc_total_payroll, enc_mean_payroll, employees = encrypted_payroll_report(context, workforce_path, tax_rate)
+    print(f"Decrypted total payroll for {employees} employees: {enc_total_payroll.decrypt()[0]:,.2f}")
+    if enc_mean_payroll is not None:
+        print(f"Decrypted mean net salary: {enc_mean_payroll.decrypt()[0]:,.2f}")
+
+
+
+
+    # Step 7: Graph plot
+
+    # Converts decrypted salaries to numpy array for plotting
+    dec_net_salary_graph = np.arange(len(dec_net_salary))  # Employee indices
+
+    # Plot the decrypted net salaries
+    plt.figure(figsize=(10, 5))
+    plt.bar(dec_net_salary_graph, dec_net_salary, color="green")
+
+    # Labels and title
+    plt.xlabel("Employee Index")
+    plt.ylabel("Net Salary ($)")
+    plt.title("Decrypted Net Salary per Employee")
+    plt.xticks(dec_net_salary_graph)  # Set employee indices as x-axis labels
+    plt.grid(axis = "y", linestyle = "--", alpha = 0.7)
+
+    # Show the plot
+    plt.show()
@@ -18,87 +18,503 @@
 import time # For time
 import pyotp  # For generating TOTP (Time-based One-Time Password)
 import hashlib  # For secure hashing of passwords
-
-
-
-
-# Step 2: Define a predefined password
-password = "SecureP@ss123"  # This is the password you will input
-
-# Precompute the SHA-256 hash of the password for comparison
-expected_password_hash = hashlib.sha256(password.encode()).hexdigest()
-
-
-
-
-# Step 3: Ask for user input (password)
-input_password = input("Enter your password: ")
-
-
-
-
-# Step 4: Hash the entered password
-input_password_hash = hashlib.sha256(input_password.encode()).hexdigest()
-
-
-
-
-
-# Step 5: Validate the password
-if input_password_hash == expected_password_hash:
-    print("\nPassword is correct. Proceeding with 2FA...\n")
-    
-    
-    
-    
-
-    # Step 6: Initialize 2FA (Time-based One-Time Password)
-    totp = pyotp.TOTP(pyotp.random_base32())
-    print(f"Your secret key (for first-time setup): {totp.secret}")
-
-    time.sleep(10)  # Wait for 10 seconds before user enters the code
-    
-
-
-
-    # Step 7: Generate a 6-digit OTP code using the secret key and print it for testing
-    otp_code = totp.now()  # Generate a 6-digit code
-    print(f"Generated OTP Code: {otp_code}")  # You can remove this line after testing
-
-
-
-
-    # Step 8: Ask for the OTP input
-    input_code = input("Enter the 2FA Code: ")
-    
-
-
-
-
-    # Step 9: Validate the OTP code
-    if totp.verify(input_code):
-        print("2FA code is valid. Access granted.")
+import argparse # For the command-line options
+import asyncio # For serving many login sessions at once
+import collections # For the user record type
+import concurrent.futures # For the bounded password-hashing pool
+import hmac # For constant-time hash comparison
+import json # For the login protocol
+import os # For random salts and fsync
+import queue # For the audit-log record queue
+import threading # For the background audit-log writer
+
+
+
+
+# Step 2: Define the password hashing scheme
+# Passwords are stored as salted PBKDF2-HMAC-SHA256 hashes: "pbkdf2_sha256$iterations$salt$hash".
+# The iteration count is the cost knob; raising it slows down offline guessing, and hashes stored with fewer
+# iterations are upgraded on the user's next successful login.
+PBKDF2_ITERATIONS = 600_000
+SALT_BYTES = 16
+
+def hash_password(password, iterations = PBKDF2_ITERATIONS, salt = None):
+    salt = os.urandom(SALT_BYTES) if salt is None else salt
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+    return f"pbkdf2_sha256${iterations}${salt.hex()}${digest.hex()}"
+
+def verify_password(password, stored_hash):
+    # Recomputes the hash with the stored salt and cost, then compares in constant time
+    _, iterations, salt, digest = stored_hash.split("$")
+    candidate = hashlib.pbkdf2_hmac("sha256", password.encode(), bytes.fromhex(salt), int(iterations))
+    return hmac.compare_digest(candidate, bytes.fromhex(digest))
+
+def hash_iterations(stored_hash):
+    return int(stored_hash.split("$")[1])
+
+
+
+
+# Step 3: Define the in-memory user store
+ACCEPTED = "ACCEPTED"
+UNKNOWN_USER = "UNKNOWN_USER"
+BAD_PASSWORD = "BAD_PASSWORD"
+BAD_CODE = "BAD_CODE"
+REPLAYED_CODE = "REPLAYED_CODE"
+LOCKED_OUT = "LOCKED_OUT"
+# Clients only ever see BAD_CREDENTIALS for an unknown user or a wrong password, so usernames cannot be enumerated;
+# the audit log keeps the exact outcome
+BAD_CREDENTIALS = "BAD_CREDENTIALS"
+WIRE_OUTCOMES = {UNKNOWN_USER: BAD_CREDENTIALS, BAD_PASSWORD: BAD_CREDENTIALS}
+
+UserRecord = collections.namedtuple("UserRecord", ["password_hash", "totp_secret"])
+
+class UserStore:
+    def __init__(self, iterations = PBKDF2_ITERATIONS):
+        self.iterations = iterations # Cost used for new and upgraded hashes
+        self.users = {}
+        # Unknown users are checked against this hash so they take as long to reject as a wrong password
+        self.dummy_hash = hash_password(os.urandom(SALT_BYTES).hex(), iterations)
+
+    def add_user(self, username, password, totp_secret = None):
+        # Registers a user and returns their TOTP secret for first-time setup
+        totp_secret = totp_secret or pyotp.random_base32()
+        self.users[username] = UserRecord(hash_password(password, self.iterations), totp_secret)
+        return totp_secret
+
+    def get(self, username):
+        return self.users.get(username)
+
+    def update_hash(self, username, password_hash):
+        self.users[username] = self.users[username]._replace(password_hash = password_hash)
+
+
+
+
+# Step 4: Define the TOTP verification layer
+# Each user's codes for the accepted windows are computed once per 30-second window and cached, and a submitted code is
+# compared against every candidate in constant time. Accepted (user, counter) pairs go into a replay set so each code works
+# only once. Both the code cache and the replay set are bucketed by counter: whole buckets are dropped once their window
+# can no longer verify, so memory is bounded by the logins of the last few windows.
+class TOTPVerifier:
+    def __init__(self, user_store, valid_window = 1, interval = 30):
+        self.user_store = user_store
+        self.valid_window = valid_window # Earlier windows still accepted, for clock drift and queued logins
+        self.interval = interval
+        self.code_buckets = {} # counter -> {username: [(counter, code), ...]}
+        self.used_buckets = collections.defaultdict(set) # counter -> usernames whose code for that counter was used
+
+    def evict(self, counter):
+        # Drops buckets for windows that can no longer be accepted
+        oldest = counter - self.valid_window
+        for buckets in (self.code_buckets, self.used_buckets):
+            for stale in [bucket for bucket in buckets if bucket < oldest or bucket > counter]:
+                del buckets[stale]
+
+    def candidate_codes(self, username, counter):
+        bucket = self.code_buckets.get(counter)
+        if bucket is None:
+            self.evict(counter)
+            bucket = self.code_buckets[counter] = {}
+        if username not in bucket:
+            totp = pyotp.TOTP(self.user_store.get(username).totp_secret, interval = self.interval)
+            bucket[username] = [(window, totp.generate_otp(window)) for window in range(counter - self.valid_window, counter + 1)]
+        return bucket[username]
+
+    def verify(self, username, code, now = None):
+        # Returns ACCEPTED, BAD_CODE or REPLAYED_CODE
+        counter = int(time.time() if now is None else now) // self.interval
+        matched = None
+        for window, candidate in self.candidate_codes(username, counter):
+            if hmac.compare_digest(candidate.encode(), str(code).encode()):
+                matched = window
+        if matched is None:
+            return BAD_CODE
+        if username in self.used_buckets[matched]:
+            return REPLAYED_CODE
+        self.used_buckets[matched].add(username)
+        return ACCEPTED
+
+
+
+
+# Step 5: Log the login attempts (successful or failed)
+# Logins only put a structured record on an in-memory queue; a single background writer drains it in batches, so a burst
+# of logins becomes a few large appends instead of one open/write/close per attempt. After a batch takes it past
+# max_bytes, or once it is older than rotate_seconds, the log rotates into numbered backups (login_attempts.log.1 is the
+# newest). fsync_policy controls durability: "batch" syncs after every batch, "interval" at most every fsync_interval
+# seconds, "never" leaves it to the OS; flush() always syncs. The writer wakes up at least every idle_tick seconds, so
+# interval syncs and time-based rotation also happen when no new records arrive.
+class AuditLog:
+    def __init__(self, path = "login_attempts.log", max_bytes = 10 * 1024 * 1024, rotate_seconds = None, backup_count = 5,
+                 fsync_policy = "batch", fsync_interval = 1.0, batch_size = 512, max_queue = 100_000):
+        if fsync_policy not in ("batch", "interval", "never"):
+            raise ValueError(f"Unknown fsync policy {fsync_policy!r}")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.rotate_seconds = rotate_seconds
+        self.backup_count = backup_count
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval
+        self.batch_size = batch_size
+        self.idle_tick = min(fsync_interval, rotate_seconds or fsync_interval, 1.0)
+        self.records = queue.Queue(max_queue) # A full queue makes writers wait rather than drop audit records
+        # When the queue is full, record_async waits for room on this thread instead of blocking the event loop
+        self.overflow_executor = concurrent.futures.ThreadPoolExecutor(max_workers = 1)
+        self.written_count = 0
+        self.unsynced = False # Records written since the last fsync
+        self.closed = False
+        self.open_log()
+        self.writer = threading.Thread(target = self.write_records, daemon = True)
+        self.writer.start()
+
+    def open_log(self):
+        self.log_file = open(self.path, "a", encoding = "utf-8")
+        self.opened_at = time.time()
+        self.last_fsync = time.monotonic()
+
+    def make_record(self, user, source, outcome, latency):
+        if self.closed:
+            raise ValueError("Audit log is closed")
+        return {"time": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "user": user, "source": source,
+                "outcome": outcome, "latency_ms": round(latency * 1000, 3)}
+
+    def record(self, user, source, outcome, latency):
+        # For threads: waits for room when the queue is full
+        self.records.put(self.make_record(user, source, outcome, latency))
+
+    async def record_async(self, user, source, outcome, latency):
+        # For the event loop: never blocks it; only the calling login waits when the queue is full
+        item = self.make_record(user, source, outcome, latency)
+        try:
+            self.records.put_nowait(item)
+        except queue.Full:
+            await asyncio.get_running_loop().run_in_executor(self.overflow_executor, self.records.put, item)
+
+    def flush(self):
+        # Waits until everything recorded so far is written and synced to disk; a closed log is already synced
+        if self.closed:
+            return
+        done = threading.Event()
+        self.records.put(done)
+        done.wait()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.overflow_executor.shutdown()
+        self.records.put(None)
+        self.writer.join()
+
+    def sync(self):
+        self.log_file.flush()
+        os.fsync(self.log_file.fileno())
+        self.last_fsync = time.monotonic()
+        self.unsynced = False
+
+    def rotate(self):
+        # Shifts login_attempts.log.N up by one, dropping the oldest, and starts a fresh log
+        self.log_file.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{index}"):
+                os.replace(f"{self.path}.{index}", f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.open_log()
+
+    def write_records(self):
+        running = True
+        while running:
+            try:
+                batch = [self.records.get(timeout = self.idle_tick)]
+            except queue.Empty:
+                batch = [] # Idle: still check the interval sync and time-based rotation below
+            while batch and len(batch) < self.batch_size:
+                try:
+                    batch.append(self.records.get_nowait())
+                except queue.Empty:
+                    break
+            lines = []
+            flush_requests = []
+            for item in batch:
+                if item is None:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    flush_requests.append(item)
+                else:
+                    lines.append(json.dumps(item) + "\n")
+            if lines:
+                self.log_file.write("".join(lines))
+                self.log_file.flush()
+                self.written_count += len(lines)
+                self.unsynced = True
+            interval_due = self.fsync_policy == "interval" and time.monotonic() - self.last_fsync >= self.fsync_interval
+            if self.unsynced and (flush_requests or not running or self.fsync_policy == "batch" or interval_due):
+                self.sync()
+            for done in flush_requests:
+                done.set()
+            too_big = self.max_bytes is not None and self.log_file.tell() >= self.max_bytes
+            too_old = self.rotate_seconds is not None and time.time() - self.opened_at >= self.rotate_seconds
+            if running and self.log_file.tell() > 0 and (too_big or too_old):
+                if self.unsynced and self.fsync_policy != "never":
+                    self.sync()
+                self.rotate()
+        self.log_file.close()
+
+
+
+
+# Step 6: Throttle repeated failures per user and per source
+# Failed attempts are counted in fixed windows and read as a sliding window: the previous window's count is weighted by how
+# much of it still overlaps the last window_seconds. Each check is a couple of dict lookups, and only the current and
+# previous windows are kept, so older counters are dropped as whole buckets. Each bucket counts up to max_keys keys
+# exactly; during a flood, further keys go into a fixed-size count-min sketch, which can only overestimate, so lockout
+# stays in force (at worst an innocent key is throttled early) while memory stays bounded. Users and sources are counted
+# in separate buckets, so a flood of guesses from many addresses cannot fill the table the user counts live in.
+# Only failures are ever counted. Logins still being checked are tracked in an exact per-user in-flight counter that is
+# always released when they finish, so a burst of parallel guesses at one account cannot all slip in before the first
+# failure is recorded, and successful logins leave nothing behind.
+class FailureCounts:
+    # One window's failure counts: exact for the first max_keys keys, approximate (count-min) for the rest
+    def __init__(self, max_keys, sketch_width, sketch_depth):
+        self.max_keys = max_keys
+        self.exact = {}
+        self.sketch_width = sketch_width
+        self.sketch_depth = sketch_depth
+        self.sketch = None # Allocated on the first overflow, so quiet windows stay small
+
+    def sketch_cells(self, key):
+        return [(row, hash((row, key)) % self.sketch_width) for row in range(self.sketch_depth)]
+
+    def get(self, key):
+        if key in self.exact:
+            return self.exact[key]
+        if self.sketch is None:
+            return 0
+        return min(self.sketch[row][column] for row, column in self.sketch_cells(key))
+
+    def add(self, key):
+        # Returns False if the key had to go into the sketch
+        if key in self.exact or len(self.exact) < self.max_keys:
+            self.exact[key] = self.exact.get(key, 0) + 1
+            return True
+        if self.sketch is None:
+            self.sketch = [[0] * self.sketch_width for _ in range(self.sketch_depth)]
+        for row, column in self.sketch_cells(key):
+            self.sketch[row][column] += 1
+        return False
+
+class LockoutEngine:
+    def __init__(self, max_user_failures = 5, max_source_failures = 20, window_seconds = 900, max_keys = 100_000,
+                 sketch_width = 65_536, sketch_depth = 4):
+        self.limits = {"user": max_user_failures, "source": max_source_failures}
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys # Per kind, so users and sources each get their own exact table and sketch
+        self.sketch_width = sketch_width
+        self.sketch_depth = sketch_depth
+        self.buckets = {kind: {} for kind in self.limits} # kind -> window index -> FailureCounts
+        self.in_flight = {} # username -> logins started but not yet finished
+        self.sketched_count = 0 # Failures counted approximately because a bucket was full
+
+    def current_window(self, kind, now):
+        buckets = self.buckets[kind]
+        index = int(now // self.window_seconds)
+        for stale in [bucket for bucket in buckets if bucket < index - 1]:
+            del buckets[stale]
+        if index not in buckets:
+            buckets[index] = FailureCounts(self.max_keys, self.sketch_width, self.sketch_depth)
+        return index, buckets[index]
+
+    def failures(self, kind, key, now):
+        index, current = self.current_window(kind, now)
+        overlap = 1 - (now % self.window_seconds) / self.window_seconds
+        previous = self.buckets[kind].get(index - 1)
+        return current.get(key) + (previous.get(key) * overlap if previous else 0)
+
+    def allowed(self, username, source, now = None):
+        now = time.time() if now is None else now
+        user_count = self.failures("user", username, now) + self.in_flight.get(username, 0)
+        return user_count < self.limits["user"] and self.failures("source", source, now) < self.limits["source"]
+
+    def charge(self, kind, key, now = None):
+        _, current = self.current_window(kind, time.time() if now is None else now)
+        if not current.add(key):
+            self.sketched_count += 1
+
+    def start_attempt(self, username):
+        self.in_flight[username] = self.in_flight.get(username, 0) + 1
+
+    def finish_attempt(self, username, source, success, now = None):
+        # Always releases the in-flight slot taken by start_attempt; failures are charged to both the user and the source
+        self.in_flight[username] -= 1
+        if not self.in_flight[username]:
+            del self.in_flight[username]
+        if not success:
+            self.charge("user", username, now)
+            self.charge("source", source, now)
+
+
+
+
+# Step 7: Define the authentication service
+# Logins run as asyncio tasks, so hundreds of sessions can be in progress at once. The expensive KDF runs on a bounded
+# thread pool (hashlib releases the GIL while hashing), which keeps the event loop free to accept and answer other logins.
+
+class AuthenticationService:
+    def __init__(self, user_store, hash_workers = 4, totp_verifier = None, audit_log = None, lockout = None, stage_timer = None):
+        self.user_store = user_store
+        self.stage_timer = stage_timer # Optional callback used by the load test to time each stage
+        self.lockout = lockout or LockoutEngine()
+        self.totp_verifier = totp_verifier or TOTPVerifier(user_store)
+        self.audit_log = audit_log or AuditLog()
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers = hash_workers)
+
+    async def run_hashing(self, function, *arguments):
+        # Runs a KDF call on the hashing pool, reporting the time spent waiting for a free thread ("hash_queue")
+        # separately from the KDF itself ("hash"), which is timed inside the worker
+        def timed_call():
+            started = time.perf_counter()
+            return function(*arguments), started, time.perf_counter()
+        submitted = time.perf_counter()
+        result, started, finished = await asyncio.get_running_loop().run_in_executor(self.executor, timed_call)
+        self.report_stage("hash_queue", started - submitted)
+        self.report_stage("hash", finished - started)
+        return result
+
+    async def verify_password(self, username, password):
+        record = self.user_store.get(username)
+        stored_hash = self.user_store.dummy_hash if record is None else record.password_hash
+        password_ok = await self.run_hashing(verify_password, password, stored_hash)
+        if record is None:
+            return UNKNOWN_USER
+        if not password_ok:
+            return BAD_PASSWORD
+        if hash_iterations(stored_hash) < self.user_store.iterations:
+            self.user_store.update_hash(username, await self.run_hashing(hash_password, password, self.user_store.iterations))
+        return ACCEPTED
+
+    def report_stage(self, stage, seconds):
+        # Passes a stage duration to stage_timer(stage, seconds), if one was given
+        if self.stage_timer is not None:
+            self.stage_timer(stage, seconds)
+
+    def record_stage(self, stage, stage_start):
+        # Reports how long a login stage has taken since stage_start; returns the current time
+        now = time.perf_counter()
+        self.report_stage(stage, now - stage_start)
+        return now
+
+    async def login(self, username, password, code, source = "local"):
+        # Password first, then the 2FA code; returns one of the outcome constants above
+        start_time = stage_start = time.perf_counter()
+        if not self.lockout.allowed(username, source):
+            outcome = LOCKED_OUT # Rejected before any hashing work is spent on the guess
+            stage_start = self.record_stage("lockout", stage_start)
+        else:
+            self.lockout.start_attempt(username)
+            stage_start = self.record_stage("lockout", stage_start)
+            outcome = None
+            try:
+                outcome = await self.verify_password(username, password) # Reports the hash_queue and hash stages itself
+                stage_start = time.perf_counter()
+                if outcome == ACCEPTED:
+                    outcome = self.totp_verifier.verify(username, code)
+                    stage_start = self.record_stage("totp", stage_start)
+            finally:
+                self.lockout.finish_attempt(username, source, outcome == ACCEPTED) # An attempt that raised counts as a failure
+        await self.audit_log.record_async(username, source, outcome, time.perf_counter() - start_time)
+        self.record_stage("logging", stage_start)
+        return outcome
+
+    def close(self):
+        self.executor.shutdown()
+        self.audit_log.close()
+
+async def serve_authentication(service, host = "127.0.0.1", port = 0):
+    # Starts an asyncio server that answers one JSON login per line, {"user": ..., "password": ..., "code": ...},
+    # with the outcome. Logins on one connection are answered in order; separate connections proceed concurrently.
+    async def handle_client(reader, writer):
+        source = writer.get_extra_info("peername")[0] # Client address without the port, so lockouts follow the host
+        while line := await reader.readline():
+            try:
+                record = json.loads(line)
+                fields = [record["user"], record["password"], record["code"]]
+                if not all(isinstance(field, str) for field in fields):
+                    raise TypeError("user, password and code must be strings")
+                outcome = await service.login(*fields, source)
+            except (ValueError, KeyError, TypeError):
+                outcome = "MALFORMED"
+            writer.write(WIRE_OUTCOMES.get(outcome, outcome).encode() + b"\n")
+            await writer.drain()
+        writer.close()
+    return await asyncio.start_server(handle_client, host, port)
+
+async def send_login(host, port, username, password, code):
+    # Local client for serve_authentication: one login on its own connection
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(json.dumps({"user": username, "password": password, "code": code}).encode() + b"\n")
+    await writer.drain()
+    outcome = (await reader.readline()).decode().strip()
+    writer.close()
+    await writer.wait_closed()
+    return outcome
+
+
+
+
+# Step 8: Run a single interactive login, or a burst of concurrent logins against a local server
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "MFA login for the smart healthcare portal.")
+    parser.add_argument("--concurrent", type = int, metavar = "LOGINS", help = "Simulate this many simultaneous logins instead of prompting")
+    parser.add_argument("--iterations", type = int, default = PBKDF2_ITERATIONS, help = "PBKDF2 iterations for stored password hashes")
+    parser.add_argument("--hash-workers", type = int, default = 4, help = "Threads used for password hashing")
+    args = parser.parse_args()
+
+    # Define a predefined password
+    password = "SecureP@ss123"  # This is the password you will input
+    user_store = UserStore(args.iterations)
+    totp_secret = user_store.add_user("doctor", password)
+    totp = pyotp.TOTP(totp_secret)
+    # Every simulated login comes from this machine, so the per-source limit has to cover the whole burst
+    lockout = LockoutEngine(max_source_failures = max(20, args.concurrent or 0))
+    service = AuthenticationService(user_store, args.hash_workers, lockout = lockout)
+
+    if args.concurrent:
+        # A shift change: many staff log in at once, a few of them mistyping their password
+        for i in range(args.concurrent):
+            user_store.add_user(f"staff{i}", password)
+
+        async def shift_change():
+            server = await serve_authentication(service)
+            port = server.sockets[0].getsockname()[1]
+            logins = []
+            for i in range(args.concurrent):
+                code = pyotp.TOTP(user_store.get(f"staff{i}").totp_secret).now()
+                attempt = password if i % 10 else "wrong password"
+                logins.append(send_login("127.0.0.1", port, f"staff{i}", attempt, code))
+            start_time = time.perf_counter()
+            outcomes = await asyncio.gather(*logins)
+            elapsed = time.perf_counter() - start_time
+            server.close()
+            await server.wait_closed()
+            print(f"{len(outcomes)} logins in {elapsed:.2f}s ({len(outcomes) / elapsed:.1f} logins/s)")
+            for outcome in sorted(set(outcomes)):
+                print(f"{outcome}: {outcomes.count(outcome)}")
+        asyncio.run(shift_change())
     else:
-        print("Invalid 2FA code. Access denied.")
-else:
-    print("Incorrect password. Access denied.")
-
-
-
-
-
-
-# Step 10: Log the login attempt (successful or failed)
-def log_attempt(success):
-    timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
-    status = "SUCCESS" if success else "FAILED"
-    with open("login_attempts.log", "a") as log_file:
-        log_file.write(f"{timestamp} - Login attempt {status}\n")
-
-# After verification:
-if totp.verify(input_code):
-    print("2FA code is valid. Access granted.")
-    log_attempt(True)  # Log successful attempt
-else:
-    print("Invalid 2FA code. Access denied.")
-    log_attempt(False)  # Log failed attempt
+        # Ask for the password and the 2FA code
+        print(f"Your secret key (for first-time setup): {totp.secret}")
+        print(f"Generated OTP Code: {totp.now()}")  # You can remove this line after testing
+        input_password = input("Enter your password: ")
+        input_code = input("Enter the 2FA Code: ")
+        outcome = asyncio.run(service.login("doctor", input_password, input_code, "console"))
+        if outcome == ACCEPTED:
+            print("2FA code is valid. Access granted.")
+        elif outcome in (BAD_CODE, REPLAYED_CODE):
+            print("Invalid 2FA code. Access denied.")
+        else:
+            print("Incorrect password. Access denied.")
+    service.close()
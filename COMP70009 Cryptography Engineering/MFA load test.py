@@ -0,0 +1,217 @@
+# Scenario: Sizing the authentication tier of the smart healthcare portal
+# Background:
+# Before rollout the hospital needs to know how many password + 2FA logins per second the service in "MFA hopsital.py" can take,
+# and which stage of a login (waiting for a hashing thread, password hashing, TOTP checking or audit logging) the time goes to.
+# This script starts a local instance of the service, simulates thousands of staff logging in at once with a mix of valid,
+# invalid and replayed codes, and reports throughput and p50/p95/p99 latencies end to end and per stage.
+
+# Usage:
+# python "MFA load test.py" --users 2000 --concurrency 500
+# python "MFA load test.py" --users 200 --output results.json
+
+
+
+
+
+
+
+
+# Step 1: Load the libraries
+import argparse  # For command-line options
+import asyncio  # For the simulated clients
+import collections  # For collecting latency samples
+import importlib.util  # For loading the service module from its file
+import json  # For machine-readable results
+import os  # For locating the service module and the temporary audit log
+import platform  # For recording the machine the results came from
+import random  # For choosing each simulated user's behaviour
+import sys  # For registering the loaded module under an importable name
+import tempfile  # For keeping the load test's audit log out of the real one
+import time  # For timing logins
+
+
+
+
+
+
+
+# Step 2: Load the service from "MFA hopsital.py", the same way "blockchain benchmark.py" loads the ledger
+def load_mfa():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "MFA hopsital.py")
+    spec = importlib.util.spec_from_file_location("mfa_hospital", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+mfa = load_mfa()
+
+
+
+
+
+
+
+# Step 3: Define the simulated users
+# Each simulated user opens one connection and follows one behaviour:
+#   valid             - correct password and current code
+#   invalid_password  - wrong password
+#   invalid_code      - correct password, wrong code
+#   replay            - a valid login, then the same code sent again, which must be refused
+
+PASSWORD = "SecureP@ss123"
+
+def choose_behaviours(users, invalid_password, invalid_code, replay, seed):
+    generator = random.Random(seed)
+    behaviours = []
+    for _ in range(users):
+        roll = generator.random()
+        if roll < invalid_password:
+            behaviours.append("invalid_password")
+        elif roll < invalid_password + invalid_code:
+            behaviours.append("invalid_code")
+        elif roll < invalid_password + invalid_code + replay:
+            behaviours.append("replay")
+        else:
+            behaviours.append("valid")
+    return behaviours
+
+async def login_on(reader, writer, username, password, code):
+    writer.write(json.dumps({"user": username, "password": password, "code": code}).encode() + b"\n")
+    await writer.drain()
+    return (await reader.readline()).decode().strip()
+
+async def simulate_user(port, username, totp_secret, behaviour, connections, latencies, outcomes):
+    # Runs one user's logins on its own connection, recording each login's latency and whether the outcome was the expected one
+    # An overloaded service can take longer than the TOTP windows to answer; valid logins then come back as BAD_CODE
+    # and are reported with expected = false
+    async with connections:
+        code = mfa.pyotp.TOTP(totp_secret).now()  # Read once the user gets a connection, like a person typing it in
+        if behaviour == "invalid_password":
+            attempts = [(PASSWORD + "!", code, mfa.BAD_CREDENTIALS)]
+        elif behaviour == "invalid_code":
+            attempts = [(PASSWORD, f"{(int(code) + 1) % 1_000_000:06d}", mfa.BAD_CODE)]
+        elif behaviour == "replay":
+            attempts = [(PASSWORD, code, mfa.ACCEPTED), (PASSWORD, code, mfa.REPLAYED_CODE)]
+        else:
+            attempts = [(PASSWORD, code, mfa.ACCEPTED)]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        for password, attempt_code, expected in attempts:
+            start_time = time.perf_counter()
+            outcome = await login_on(reader, writer, username, password, attempt_code)
+            latencies["login"].append(time.perf_counter() - start_time)
+            outcomes[(behaviour, outcome, outcome == expected)] += 1
+        writer.close()
+        await writer.wait_closed()
+
+
+
+
+
+
+
+# Step 4: Summarise the latency samples
+def percentile(sorted_samples, fraction):
+    # Nearest-rank percentile of an already sorted list
+    if not sorted_samples:
+        return None
+    return sorted_samples[min(len(sorted_samples) - 1, max(0, round(fraction * len(sorted_samples)) - 1))]
+
+def summarise(samples):
+    samples = sorted(samples)
+    return {
+        "count": len(samples),
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p95_ms": percentile(samples, 0.95) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "max_ms": samples[-1] * 1000,
+    }
+
+
+
+
+
+
+
+# Step 5: Run the load test
+async def run_load_test(users, concurrency, iterations, hash_workers, mix, seed, audit_path):
+    user_store = mfa.UserStore(iterations)
+    # Registering thousands of users at full cost would take longer than the test, so they share one salted hash;
+    # verifying it costs exactly as much as verifying a hash of their own
+    password_hash = mfa.hash_password(PASSWORD, iterations)
+    totp_secrets = [mfa.pyotp.random_base32() for _ in range(users)]
+    for i, totp_secret in enumerate(totp_secrets):
+        user_store.users[f"staff{i}"] = mfa.UserRecord(password_hash, totp_secret)
+    behaviours = choose_behaviours(users, *mix, seed)
+
+    latencies = collections.defaultdict(list)
+    outcomes = collections.Counter()
+    audit_log = mfa.AuditLog(audit_path, max_bytes = None)
+    # Every simulated user connects from this machine, so the per-source limit must not cut the test short
+    lockout = mfa.LockoutEngine(max_source_failures = 2 * users + 1)
+    service = mfa.AuthenticationService(user_store, hash_workers, audit_log = audit_log, lockout = lockout,
+                                        stage_timer = lambda stage, seconds: latencies[stage].append(seconds))
+    server = await mfa.serve_authentication(service)
+    port = server.sockets[0].getsockname()[1]
+
+    connections = asyncio.Semaphore(concurrency)  # Simultaneous client connections
+    start_time = time.perf_counter()
+    await asyncio.gather(*[simulate_user(port, f"staff{i}", totp_secrets[i], behaviours[i], connections, latencies, outcomes) for i in range(users)])
+    elapsed = time.perf_counter() - start_time
+    server.close()
+    await server.wait_closed()
+
+    flush_start = time.perf_counter()
+    audit_log.flush()
+    audit_flush_seconds = time.perf_counter() - flush_start
+    service.close()
+
+    logins = len(latencies["login"])
+    return {
+        "logins": logins,
+        "seconds": elapsed,
+        "logins_per_second": logins / elapsed,
+        "latency": {stage: summarise(samples) for stage, samples in latencies.items()},
+        "outcomes": [{"behaviour": behaviour, "outcome": outcome, "expected": expected, "count": count}
+                     for (behaviour, outcome, expected), count in sorted(outcomes.items())],
+        "audit_records_written": audit_log.written_count,
+        "audit_flush_seconds": audit_flush_seconds,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description = "Load-test the MFA login service.")
+    parser.add_argument("--users", type = int, default = 2000, help = "Simulated users, each logging in once (twice for replays)")
+    parser.add_argument("--concurrency", type = int, default = 500, help = "Simultaneous client connections")
+    parser.add_argument("--iterations", type = int, default = mfa.PBKDF2_ITERATIONS, help = "PBKDF2 iterations for the users' password hashes")
+    parser.add_argument("--hash-workers", type = int, default = os.cpu_count(), help = "Threads the service uses for password hashing")
+    parser.add_argument("--invalid-password", type = float, default = 0.10, help = "Fraction of users sending a wrong password")
+    parser.add_argument("--invalid-code", type = float, default = 0.05, help = "Fraction of users sending a wrong 2FA code")
+    parser.add_argument("--replay", type = float, default = 0.10, help = "Fraction of users replaying their 2FA code")
+    parser.add_argument("--seed", type = int, default = 0, help = "Seed for choosing each user's behaviour")
+    parser.add_argument("--output", help = "File to write the JSON results to (default: print them)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as audit_directory:
+        mix = (args.invalid_password, args.invalid_code, args.replay)
+        results = asyncio.run(run_load_test(args.users, args.concurrency, args.iterations, args.hash_workers, mix, args.seed,
+                                            os.path.join(audit_directory, "login_attempts.log")))
+    results["metadata"] = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "users": args.users,
+        "concurrency": args.concurrency,
+        "iterations": args.iterations,
+        "hash_workers": args.hash_workers,
+    }
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent = 2)
+        print(f"Load test results written to {args.output}")
+    else:
+        print(json.dumps(results, indent = 2))
+
+if __name__ == "__main__":
+    main()
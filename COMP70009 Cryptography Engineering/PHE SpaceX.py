@@ -19,7 +19,391 @@
 # A Python 3 library implementing the Paillier Partially Homomorphic Encryption.
 
 from phe import paillier
+from phe.util import mulmod, powmod
+import argparse # For the batch-mode command-line options
+import collections # For the queue of in-flight precomputation batches
+import csv # For reading stage readings files
+import json # For the keypair file and the JSON-lines operation results
+import math # For rejecting non-finite operation inputs
+import multiprocessing # For the background precomputation worker pool
+import os # For counting CPU cores
+import queue # For the bounded obfuscator buffer
 import random
+import secrets # For the random r in each obfuscator r^n mod n^2
+import sys # For writing operation results to stdout
+import threading # For the buffer refill thread
+import time # For measuring encryption rates
+
+# Paillier randomness precomputation
+# Every Paillier encryption multiplies by an obfuscator r^n mod n^2, a full modular exponentiation that does not depend
+# on the value being encrypted. PrecomputedEncryptor computes these in a background process pool into a bounded buffer,
+# so an encryption on the hot path only costs a multiplication.
+
+def _compute_obfuscators(n, count):
+    # Pool worker: returns `count` fresh obfuscators r^n mod n^2 with r uniform in [1, n)
+    nsquare = n * n
+    return [powmod(secrets.randbelow(n - 1) + 1, n, nsquare) for _ in range(count)]
+
+def _mark_obfuscated(encrypted):
+    # The ciphertext already carries r^n, so ciphertext() must not obfuscate it again. phe has no public setter for this:
+    # phe 1.x (checked against 1.4 and 1.5) keeps the flag in the name-mangled EncryptedNumber.__is_obfuscated.
+    # If a later phe drops that attribute, fall back to the public obfuscate(), which is still correct but pays for a second r^n
+    if hasattr(encrypted, "_EncryptedNumber__is_obfuscated"):
+        encrypted._EncryptedNumber__is_obfuscated = True
+    else:
+        encrypted.obfuscate()
+
+class PrecomputedEncryptor:
+    # Paillier encryption front-end backed by a refilling buffer of precomputed obfuscators
+    def __init__(self, public_key, buffer_size = 1024, workers = None, batch_size = 8):
+        self.public_key = public_key
+        self.buffer = queue.Queue(maxsize = buffer_size) # Ready obfuscators
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size # Obfuscators computed per pool task
+        self.encryption_count = 0
+        self.starvation_count = 0 # Encryptions that found the buffer empty and paid for their own obfuscator
+        self.stopped = threading.Event()
+        self.pool = multiprocessing.get_context().Pool(self.workers)
+        self.refill_thread = threading.Thread(target = self._refill, daemon = True)
+        self.refill_thread.start()
+
+    def _refill(self):
+        # Keeps one batch per worker in flight and moves finished batches into the buffer, waiting while it is full
+        in_flight = collections.deque(self.pool.apply_async(_compute_obfuscators, (self.public_key.n, self.batch_size)) for _ in range(self.workers))
+        while not self.stopped.is_set():
+            in_flight[0].wait(0.1) # Short waits so close() is noticed promptly
+            if not in_flight[0].ready():
+                continue
+            batch = in_flight.popleft().get()
+            in_flight.append(self.pool.apply_async(_compute_obfuscators, (self.public_key.n, self.batch_size)))
+            for obfuscator in batch:
+                while not self.stopped.is_set():
+                    try:
+                        self.buffer.put(obfuscator, timeout = 0.1)
+                        break
+                    except queue.Full:
+                        continue
+
+    def encrypt(self, value, precision = None):
+        # Same result as public_key.encrypt(value, precision), using a buffered obfuscator when one is ready
+        encoding = paillier.EncodedNumber.encode(self.public_key, value, precision)
+        n, nsquare = self.public_key.n, self.public_key.nsquare
+        try:
+            obfuscator = self.buffer.get_nowait()
+        except queue.Empty:
+            self.starvation_count += 1
+            obfuscator = powmod(self.public_key.get_random_lt_n(), n, nsquare)
+        nude_ciphertext = (n * encoding.encoding + 1) % nsquare # (n + 1)^m = n*m + 1 mod n^2
+        encrypted = paillier.EncryptedNumber(self.public_key, mulmod(nude_ciphertext, obfuscator, nsquare), encoding.exponent)
+        _mark_obfuscated(encrypted)
+        self.encryption_count += 1
+        return encrypted
+
+    def buffer_level(self):
+        # Obfuscators ready for use
+        return self.buffer.qsize()
+
+    def wait_for_buffer(self, level, timeout = None):
+        # Blocks until at least `level` obfuscators are ready (or the timeout passes), so a short run does not start starved
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.buffer_level() < min(level, self.buffer.maxsize):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self):
+        self.stopped.set()
+        self.refill_thread.join()
+        self.pool.terminate()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+# Batch fuel-telemetry aggregation
+# Readings come from a CSV file with "stage" and "fuel" columns, many readings per stage. They are encrypted across a process
+# pool with one common precision, so every ciphertext has the same exponent and adding two of them is a single modular
+# multiplication. Sums are then formed by pairwise tree reduction in the pool, and only the final aggregates are decrypted.
+_batch_public_key = None # Public key rebuilt once in each pool worker
+
+def read_stage_readings(path):
+    # Returns {stage: [fuel readings]} in the order stages first appear in the file
+    readings = {}
+    with open(path, newline = "") as readings_file:
+        for row in csv.DictReader(readings_file):
+            readings.setdefault(row["stage"], []).append(float(row["fuel"]))
+    return readings
+
+def _init_batch_worker(n):
+    global _batch_public_key
+    _batch_public_key = paillier.PaillierPublicKey(n)
+
+def _encrypt_readings_job(job):
+    # Pool worker: encrypts a chunk of readings and returns (ciphertext, exponent) pairs
+    values, precision = job
+    encrypted = [_batch_public_key.encrypt(value, precision) for value in values]
+    return [(number.ciphertext(False), number.exponent) for number in encrypted]
+
+def _tree_product(nsquare, ciphertexts):
+    # Multiplies ciphertexts pairwise, level by level; with equal exponents this adds the plaintexts
+    while len(ciphertexts) > 1:
+        paired = [mulmod(ciphertexts[i], ciphertexts[i + 1], nsquare) for i in range(0, len(ciphertexts) - 1, 2)]
+        if len(ciphertexts) % 2:
+            paired.append(ciphertexts[-1])
+        ciphertexts = paired
+    return ciphertexts[0]
+
+def _tree_product_job(job):
+    return _tree_product(*job)
+
+def tree_sum(public_key, encrypted_numbers, pool = None, chunk_size = 256):
+    # Sums EncryptedNumbers that share one exponent; chunks are reduced in parallel when a pool is given.
+    # An empty list (e.g. a readings file with only a header) sums to an encryption of zero.
+    if not encrypted_numbers:
+        return public_key.encrypt(0)
+    exponent = encrypted_numbers[0].exponent
+    if any(number.exponent != exponent for number in encrypted_numbers):
+        raise ValueError("tree_sum needs every EncryptedNumber encrypted with the same precision")
+    ciphertexts = [number.ciphertext(False) for number in encrypted_numbers]
+    if pool is not None and len(ciphertexts) > chunk_size:
+        jobs = [(public_key.nsquare, ciphertexts[i:i + chunk_size]) for i in range(0, len(ciphertexts), chunk_size)]
+        ciphertexts = pool.map(_tree_product_job, jobs)
+    return paillier.EncryptedNumber(public_key, _tree_product(public_key.nsquare, ciphertexts), exponent)
+
+def encrypt_readings(public_key, values, pool, precision, chunk_size = 64):
+    # Encrypts readings across the pool, keeping their order
+    jobs = [(values[i:i + chunk_size], precision) for i in range(0, len(values), chunk_size)]
+    return [paillier.EncryptedNumber(public_key, ciphertext, exponent) for chunk in pool.map(_encrypt_readings_job, jobs) for ciphertext, exponent in chunk]
+
+def run_fuel_batch(public_key, private_key, readings_path, efficiency_increase_percentage = 0.10, division_factor = 5, workers = None, precision = 1e-3):
+    # Encrypts every reading, aggregates per stage and for the whole mission, and decrypts only the aggregates
+    readings = read_stage_readings(readings_path)
+    workers = workers or os.cpu_count() or 1
+    with multiprocessing.get_context().Pool(workers, initializer = _init_batch_worker, initargs = (public_key.n,)) as pool:
+        cipher_stage_totals = {stage: tree_sum(public_key, encrypt_readings(public_key, values, pool, precision), pool) for stage, values in readings.items()}
+    stages = list(cipher_stage_totals)
+    cipher_total_fuel = tree_sum(public_key, list(cipher_stage_totals.values()))
+    cipher_stage_differences = {f"{first} - {second}": cipher_stage_totals[first] - cipher_stage_totals[second] for first, second in zip(stages, stages[1:])}
+    return {
+        "readings": sum(len(values) for values in readings.values()),
+        "stage_totals": {stage: private_key.decrypt(cipher) for stage, cipher in cipher_stage_totals.items()},
+        "total_fuel": private_key.decrypt(cipher_total_fuel),
+        "stage_differences": {pair: private_key.decrypt(cipher) for pair, cipher in cipher_stage_differences.items()},
+        "efficiency_increase": private_key.decrypt(cipher_total_fuel * efficiency_increase_percentage),
+        "divided_total": private_key.decrypt(cipher_total_fuel / division_factor),
+    }
+
+# Plaintext slot packing
+# A 2048-bit Paillier plaintext can hold dozens of bounded readings side by side. Each reading gets a slot of
+# value_bits + guard_bits bits; the guard bits absorb carries, so up to 2**guard_bits additions (or multiplication by a
+# scalar up to that size) never spill into the next slot. Adding two packed ciphertexts adds every slot at once.
+# Decrypting a packed ciphertext reveals every slot, so aggregates are first folded homomorphically into one slot and
+# every other slot is hidden under a random mask; only the folded total can be read from what gets decrypted.
+STATISTICAL_SECURITY_BITS = 40 # Masked slots are within 2**-40 statistical distance of random
+
+class PackedEncoding:
+    # Packs non-negative fixed-point readings into Paillier plaintexts
+    def __init__(self, public_key, value_bits = 32, guard_bits = 16, scale = 1000):
+        self.public_key = public_key
+        self.value_bits = value_bits # Largest packed reading is 2**value_bits - 1 (after scaling)
+        self.slot_bits = value_bits + guard_bits
+        self.slots = (public_key.n.bit_length() - 1) // self.slot_bits # Packed plaintexts always stay below n
+        self.scale = scale # Readings are stored as round(reading * scale)
+
+    def pack(self, values):
+        # Turns up to `slots` readings into one integer plaintext, slot 0 in the lowest bits
+        packed = 0
+        for i, value in enumerate(values):
+            fixed_point = round(value * self.scale)
+            if not 0 <= fixed_point < 1 << self.value_bits:
+                raise ValueError(f"Reading {value} does not fit in a {self.value_bits}-bit slot at scale {self.scale}")
+            packed |= fixed_point << (i * self.slot_bits)
+        return packed
+
+    def unpack(self, plaintext, count):
+        # Splits a decrypted plaintext back into `count` readings
+        mask = (1 << self.slot_bits) - 1
+        return [((plaintext >> (i * self.slot_bits)) & mask) / self.scale for i in range(count)]
+
+    def encrypt(self, values, slots_used = None):
+        # Encrypts readings into as few packed ciphertexts as possible; slots_used leaves the upper slots empty as
+        # headroom for fold_total
+        slots_used = slots_used or self.slots
+        packed_ciphertexts = []
+        for start in range(0, len(values), slots_used):
+            chunk = values[start:start + slots_used]
+            ciphertext = self.public_key.raw_encrypt(self.pack(chunk))
+            packed_ciphertexts.append(PackedCiphertext(self, ciphertext, len(chunk), max(round(value * self.scale) for value in chunk)))
+        return packed_ciphertexts
+
+class PackedCiphertext:
+    # One Paillier ciphertext holding several slots; slot_bound is the largest value any slot can hold so far,
+    # which lets an overflow into the neighbouring slot be refused before it happens
+    def __init__(self, encoding, ciphertext, count, slot_bound):
+        self.encoding = encoding
+        self.ciphertext = ciphertext
+        self.count = count # Slots in use
+        self.slot_bound = slot_bound
+
+    def _checked(self, ciphertext, count, slot_bound):
+        if slot_bound >= 1 << self.encoding.slot_bits:
+            raise OverflowError("Packed slot would overflow its guard bits")
+        return PackedCiphertext(self.encoding, ciphertext, count, slot_bound)
+
+    def __add__(self, other):
+        # Slot-wise addition
+        nsquare = self.encoding.public_key.nsquare
+        return self._checked(mulmod(self.ciphertext, other.ciphertext, nsquare), max(self.count, other.count), self.slot_bound + other.slot_bound)
+
+    def __mul__(self, scalar):
+        # Multiplies every slot by a non-negative integer
+        if not isinstance(scalar, int) or scalar < 0:
+            raise ValueError("Packed ciphertexts can only be multiplied by non-negative integers")
+        nsquare = self.encoding.public_key.nsquare
+        return self._checked(powmod(self.ciphertext, scalar, nsquare), self.count, self.slot_bound * scalar)
+
+    def decrypt(self, private_key):
+        # Decrypts once and unpacks every slot; use decrypt_total when individual slots must stay hidden
+        return self.encoding.unpack(private_key.raw_decrypt(self.ciphertext), self.count)
+
+    def fold_total(self):
+        # Adds copies shifted up by 1 .. count-1 slots (Horner's rule, one 2**slot_bits power per step), so slot count-1
+        # holds the sum of all slots. The other slots hold partial sums, so all of them are then masked with random
+        # values small enough that no carry reaches the next slot. Returns the masked ciphertext and the total's slot.
+        encoding = self.encoding
+        if 2 * self.count - 1 > encoding.slots:
+            raise ValueError(f"Folding {self.count} slots needs {2 * self.count - 1} free slots; encrypt with slots_used <= {(encoding.slots + 1) // 2}")
+        folded = self
+        for _ in range(self.count - 1):
+            folded = self._checked(powmod(folded.ciphertext, 1 << encoding.slot_bits, encoding.public_key.nsquare), self.count, folded.slot_bound) + self
+        mask_bound = (1 << encoding.slot_bits) - folded.slot_bound
+        if mask_bound < folded.slot_bound << STATISTICAL_SECURITY_BITS:
+            raise OverflowError("Guard bits leave too little room to mask the other slots; increase guard_bits")
+        mask = 0
+        for slot in range(2 * self.count - 1):
+            if slot != self.count - 1:
+                mask |= secrets.randbelow(mask_bound) << (slot * encoding.slot_bits)
+        masked = mulmod(folded.ciphertext, encoding.public_key.raw_encrypt(mask), encoding.public_key.nsquare)
+        return masked, self.count - 1
+
+    def decrypt_total(self, private_key):
+        # Sum of all slots, decrypting only the folded, masked ciphertext
+        masked, total_slot = self.fold_total()
+        return self.encoding.unpack(private_key.raw_decrypt(masked) >> (total_slot * self.encoding.slot_bits), 1)[0]
+
+def tree_sum_packed(packed_ciphertexts):
+    # Slot-wise sum of packed ciphertexts by pairwise tree reduction
+    encoding = packed_ciphertexts[0].encoding
+    ciphertext = _tree_product(encoding.public_key.nsquare, [packed.ciphertext for packed in packed_ciphertexts])
+    return packed_ciphertexts[0]._checked(ciphertext, max(packed.count for packed in packed_ciphertexts), sum(packed.slot_bound for packed in packed_ciphertexts))
+
+def run_packed_fuel_batch(public_key, private_key, readings_path, value_bits = 32, scale = 1000):
+    # Packed variant of run_fuel_batch: each stage's readings are packed, summed slot-wise, folded into one slot and
+    # decrypted once per stage. A folded slot can hold the sum of every reading of a stage, so the guard bits cover
+    # log2(readings) carry bits plus the statistical margin for masking the other slots.
+    readings = read_stage_readings(readings_path)
+    most_readings = max((len(values) for values in readings.values()), default = 1)
+    encoding = PackedEncoding(public_key, value_bits, most_readings.bit_length() + STATISTICAL_SECURITY_BITS + 1, scale)
+    slots_used = (encoding.slots + 1) // 2 # The upper half is headroom for folding
+    stage_totals = {}
+    ciphertexts = 0
+    for stage, values in readings.items():
+        packed_ciphertexts = encoding.encrypt(values, slots_used)
+        ciphertexts += len(packed_ciphertexts)
+        stage_totals[stage] = tree_sum_packed(packed_ciphertexts).decrypt_total(private_key)
+    return {"readings": sum(len(values) for values in readings.values()), "ciphertexts": ciphertexts, "slots": slots_used, "stage_totals": stage_totals, "total_fuel": sum(stage_totals.values())}
+
+# Headless operation runner
+# Key generation costs far more than the arithmetic, so the keypair is kept in a file (owner-only permissions) and reused.
+# An operations file names encrypted inputs and the operations to run over them, one per line:
+#     input stage1 5000
+#     input stage2 3000
+#     total stage1 stage2
+#     difference stage1 stage2
+#     increase stage1 0.10
+#     divide stage1 5
+# Blank lines and lines starting with "#" are skipped. Every line produces one JSON result line with its timing.
+
+DEFAULT_KEYPAIR_PATH = os.path.join(os.path.expanduser("~"), ".phe_spacex_keypair.json")
+
+def save_keypair(private_key, path = DEFAULT_KEYPAIR_PATH):
+    # Writes to a temporary file first so a crash never leaves a half-written keypair behind
+    data = json.dumps({"n": private_key.public_key.n, "p": private_key.p, "q": private_key.q}).encode()
+    temporary_path = path + ".tmp"
+    with open(os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb") as keypair_file:
+        keypair_file.write(data)
+    os.replace(temporary_path, path)
+
+def load_keypair(path = DEFAULT_KEYPAIR_PATH):
+    with open(path) as keypair_file:
+        stored = json.load(keypair_file)
+    public_key = paillier.PaillierPublicKey(stored["n"])
+    if stored["p"] * stored["q"] != public_key.n:
+        raise ValueError(f"Keypair file {path} is inconsistent: p * q != n")
+    return public_key, paillier.PaillierPrivateKey(public_key, stored["p"], stored["q"])
+
+def load_or_create_keypair(path = DEFAULT_KEYPAIR_PATH):
+    # Returns (public_key, private_key, generated)
+    if os.path.exists(path):
+        return (*load_keypair(path), False)
+    public_key, private_key = paillier.generate_paillier_keypair()
+    save_keypair(private_key, path)
+    return public_key, private_key, True
+
+def _finite_number(text):
+    # phe cannot encode inf or nan, so they are rejected as bad input rather than left to fail inside the encoder
+    value = float(text)
+    if not math.isfinite(value):
+        raise ValueError(f"{text} is not a finite number")
+    return value
+
+def _run_operation(operation, arguments, inputs, private_key):
+    # Evaluates one operation over the encrypted inputs and returns its decrypted result
+    if operation == "total":
+        if not arguments:
+            raise ValueError("total needs at least one input")
+        return private_key.decrypt(sum((inputs[name] for name in arguments[1:]), inputs[arguments[0]]))
+    if operation == "difference":
+        first, second = arguments
+        return private_key.decrypt(inputs[first] - inputs[second])
+    if operation == "increase":
+        name, percentage = arguments
+        return private_key.decrypt(inputs[name] * _finite_number(percentage))
+    if operation == "divide":
+        name, factor = arguments
+        if _finite_number(factor) == 0:
+            raise ZeroDivisionError("Division by zero is not allowed")
+        return private_key.decrypt(inputs[name] / _finite_number(factor))
+    raise ValueError(f"Unknown operation {operation!r}")
+
+def run_operations(public_key, private_key, operations_path, output = sys.stdout):
+    # Runs every line of the operations file in one pass and writes one JSON result per line
+    inputs = {}
+    with open(operations_path) as operations_file:
+        for line_number, line in enumerate(operations_file, start = 1):
+            fields = line.split()
+            if not fields or fields[0].startswith("#"):
+                continue
+            operation, arguments = fields[0], fields[1:]
+            result = {"line": line_number, "operation": operation, "arguments": arguments}
+            start_time = time.perf_counter()
+            try:
+                if operation == "input":
+                    name, value = arguments
+                    inputs[name] = public_key.encrypt(_finite_number(value))
+                else:
+                    result["result"] = _run_operation(operation, arguments, inputs, private_key)
+            except KeyError as error:
+                result["error"] = f"Unknown input {error.args[0]!r}"
+            except (ValueError, ZeroDivisionError, OverflowError) as error:
+                result["error"] = str(error)
+            result["seconds"] = time.perf_counter() - start_time
+            output.write(json.dumps(result) + "\n")
+            output.flush()
 
 def main():
     # Step 1: Key Generation (Public & Private Keys)
@@ -29,8 +413,12 @@ def main():
     stage1_fuel = 5000  # Fuel consumption for stage 1 in liters
     stage2_fuel = 3000  # Fuel consumption for stage 2 in liters
 
-    cipher_stage1_fuel = public_key.encrypt(stage1_fuel)
-    cipher_stage2_fuel = public_key.encrypt(stage2_fuel)
+    # Encrypts through the precomputation front-end so the r^n mod n^2 work happens off the critical path
+    # Two values need only two obfuscators, so a single worker fills a small buffer before anything is encrypted
+    with PrecomputedEncryptor(public_key, buffer_size = 2, workers = 1, batch_size = 2) as encryptor:
+        encryptor.wait_for_buffer(2)
+        cipher_stage1_fuel = encryptor.encrypt(stage1_fuel)
+        cipher_stage2_fuel = encryptor.encrypt(stage2_fuel)
 
     print(f"Encrypted Stage 1 Fuel: {cipher_stage1_fuel}")
     print(f"Encrypted Stage 2 Fuel: {cipher_stage2_fuel}")
@@ -77,4 +465,38 @@ def main():
         print("Invalid choice. Please restart the program and choose a valid option.")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description = "Homomorphic fuel consumption calculator.")
+    parser.add_argument("--batch", metavar = "READINGS_CSV", help = "Aggregate a file of stage,fuel readings instead of the interactive menu")
+    parser.add_argument("--workers", type = int, help = "Processes used to encrypt readings in batch mode")
+    parser.add_argument("--packed", action = "store_true", help = "Pack many readings into each ciphertext in batch mode")
+    parser.add_argument("--operations", metavar = "OPERATIONS_FILE", help = "Run a file of operations headlessly and print JSON lines")
+    parser.add_argument("--keypair", default = DEFAULT_KEYPAIR_PATH, help = "Keypair file used (and created if missing) by --operations")
+    args = parser.parse_args()
+
+    if args.operations:
+        start_time = time.perf_counter()
+        public_key, private_key, generated = load_or_create_keypair(args.keypair)
+        print(json.dumps({"operation": "keypair", "generated": generated, "seconds": time.perf_counter() - start_time}))
+        run_operations(public_key, private_key, args.operations)
+    elif args.batch and args.packed:
+        public_key, private_key = paillier.generate_paillier_keypair()
+        start_time = time.perf_counter()
+        results = run_packed_fuel_batch(public_key, private_key, args.batch)
+        print(f"Aggregated {results['readings']} readings in {results['ciphertexts']} packed ciphertexts ({results['slots']} slots each) in {time.perf_counter() - start_time:.2f}s")
+        for stage, total in results["stage_totals"].items():
+            print(f"Decrypted {stage} Fuel: {total:.3f} liters")
+        print(f"Decrypted Total Fuel Consumption: {results['total_fuel']:.3f} liters")
+    elif args.batch:
+        public_key, private_key = paillier.generate_paillier_keypair()
+        start_time = time.perf_counter()
+        results = run_fuel_batch(public_key, private_key, args.batch, workers = args.workers)
+        print(f"Aggregated {results['readings']} encrypted readings in {time.perf_counter() - start_time:.2f}s")
+        for stage, total in results["stage_totals"].items():
+            print(f"Decrypted {stage} Fuel: {total:.3f} liters")
+        print(f"Decrypted Total Fuel Consumption: {results['total_fuel']:.3f} liters")
+        for pair, difference in results["stage_differences"].items():
+            print(f"Decrypted Difference in Fuel Usage ({pair}): {difference:.3f} liters")
+        print(f"Decrypted Efficiency Increase: {results['efficiency_increase']:.3f} liters")
+        print(f"Decrypted Division Result: {results['divided_total']:.3f} liters")
+    else:
+        main()
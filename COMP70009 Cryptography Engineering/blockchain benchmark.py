@@ -0,0 +1,154 @@
+
+
+# Scenario: Tracking the performance of the Neighborhood Coins blockchain between releases
+# Background:
+# The community ledger in "secure blockchain system.py" keeps growing, and changes to mining, validation or signing can quietly slow it down.
+# This script benchmarks the ledger the same way on every run and writes the results as JSON so two releases can be compared.
+
+# Usage:
+# python "blockchain benchmark.py" --output results.json
+# python "blockchain benchmark.py" --quick  (smaller workloads for a fast smoke run)
+
+
+
+
+
+
+
+
+# Step 1: Load the libraries
+import argparse  # For command-line options
+import contextlib  # For silencing the ledger's progress prints
+import importlib.util  # For loading the ledger module from its file
+import io  # For the silenced output buffer
+import json  # For machine-readable results
+import os  # For locating the ledger module
+import platform  # For recording the machine the results came from
+import sys  # For registering the loaded module under an importable name
+import time  # For timing each workload
+
+
+
+
+
+
+
+# Step 2: Load the blockchain module (its file name contains spaces, so it cannot be imported directly)
+def load_ledger():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "secure blockchain system.py")
+    spec = importlib.util.spec_from_file_location("secure_blockchain_system", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # Lets mining and verification pools pickle the module's functions
+    spec.loader.exec_module(module)
+    return module
+
+ledger = load_ledger()
+
+
+
+
+
+
+
+# Step 3: Define the benchmarks
+# Every workload uses fixed inputs, so repeated runs do the same work and only the timings differ.
+
+def benchmark_mining(difficulties, blocks_per_difficulty, workers=1):
+    # Hashes per second of Block.mine_block at each difficulty
+    results = []
+    for difficulty in difficulties:
+        hashes = 0
+        start_time = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(blocks_per_difficulty):
+                block = ledger.Block(format(i, "064x"), [f"Resident{i} sends {difficulty} NC to Resident{i + 1}"])
+                block.mine_block(difficulty, workers)
+                hashes += block.hash_count
+        elapsed = time.perf_counter() - start_time
+        results.append({"difficulty": difficulty, "workers": workers, "blocks": blocks_per_difficulty, "hashes": hashes, "seconds": elapsed, "hashes_per_second": hashes / elapsed})
+    return results
+
+def benchmark_validation(chain_lengths):
+    # Time for a full audit and for an incremental check after one more block, at each chain length
+    results = []
+    for chain_length in chain_lengths:
+        blockchain = ledger.Blockchain(difficulty=1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(1, chain_length):
+                blockchain.add_transaction(f"Resident{i} sends 1 NC to Resident{i + 1}")
+                blockchain.mine_pending_transactions()
+            start_time = time.perf_counter()
+            blockchain.is_valid_chain(full_audit=True)
+            full_audit_seconds = time.perf_counter() - start_time
+            blockchain.add_transaction("Resident0 sends 1 NC to Resident1")
+            blockchain.mine_pending_transactions()
+            start_time = time.perf_counter()
+            blockchain.is_valid_chain()
+            incremental_seconds = time.perf_counter() - start_time
+        results.append({"chain_length": chain_length, "full_audit_seconds": full_audit_seconds, "full_audit_blocks_per_second": (chain_length - 1) / full_audit_seconds, "incremental_seconds": incremental_seconds})
+    return results
+
+def benchmark_signatures(key_sizes, signatures):
+    # Sign and verify rates for each RSA key size (generate_keys uses 512 bits)
+    results = []
+    transactions = [f"Resident{i} sends 1 NC to Resident{i + 1}" for i in range(signatures)]
+    for key_size in key_sizes:
+        start_time = time.perf_counter()
+        public_key, private_key = ledger.rsa.newkeys(key_size)
+        keygen_seconds = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        signed = [ledger.sign_transaction(private_key, transaction) for transaction in transactions]
+        sign_seconds = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        verified = all(ledger.verify_transaction(public_key, transaction, signature) for transaction, signature in zip(transactions, signed))
+        verify_seconds = time.perf_counter() - start_time
+        results.append({"key_size": key_size, "keygen_seconds": keygen_seconds, "signs_per_second": signatures / sign_seconds, "verifies_per_second": signatures / verify_seconds, "all_verified": verified})
+    return results
+
+def benchmark_memory(blocks, transactions_per_block):
+    # Bytes retained per block for the regular and the compact block classes
+    bytes_per_block = ledger.compare_block_memory(blocks, transactions_per_block)
+    return [{"block_type": name, "blocks": blocks, "transactions_per_block": transactions_per_block, "bytes_per_block": size} for name, size in bytes_per_block.items()]
+
+
+
+
+
+
+
+# Step 4: Run the suite and write the results
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Neighborhood Coins blockchain.")
+    parser.add_argument("--output", help="File to write the JSON results to (default: print them)")
+    parser.add_argument("--quick", action="store_true", help="Use small workloads for a fast smoke run")
+    parser.add_argument("--mining-workers", type=int, default=1, help="Processes used by the mining benchmark")
+    args = parser.parse_args()
+
+    if args.quick:
+        difficulties, mined_blocks, chain_lengths, key_sizes, signatures, memory_blocks = [1, 2, 3], 3, [100, 1000], [512], 50, 1000
+    else:
+        difficulties, mined_blocks, chain_lengths, key_sizes, signatures, memory_blocks = [1, 2, 3, 4, 5], 5, [100, 1000, 10000, 50000], [512, 1024, 2048], 200, 20000
+
+    results = {
+        "metadata": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "quick": args.quick,
+        },
+        "mining": benchmark_mining(difficulties, mined_blocks, args.mining_workers),
+        "validation": benchmark_validation(chain_lengths),
+        "signatures": benchmark_signatures(key_sizes, signatures),
+        "memory": benchmark_memory(memory_blocks, 2),
+    }
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+        print(f"Benchmark results written to {args.output}")
+    else:
+        print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -13,7 +13,23 @@
 
 
 # Step 1: Load the libraries
+import asyncio  # For the streaming mempool ingestion endpoint
+import collections  # For structured transaction records
+import concurrent.futures  # For admitting streamed transactions off the event loop
+import functools  # For caching parsed public keys
 import hashlib  # For hashing the blocks
+import heapq  # For the fee-prioritised mempool
+import itertools  # For mempool arrival sequence numbers
+import json  # For serializing blocks in the on-disk block store
+import mmap  # For memory-mapping the block store index
+import multiprocessing  # For spreading proof-of-work across CPU cores
+import os  # For counting the available CPU cores and checking store files
+import re  # For parsing "<sender> sends <amount> NC to <receiver>" transactions
+import struct  # For the fixed-size block store index records
+import tempfile  # For the block store demo directory
+import threading  # For guarding the mempool against concurrent admission and mining
+import time  # For measuring the mining hash rate
+import tracemalloc  # For measuring memory used per block
 import rsa  # For digital signatures (install with `pip install rsa`)
 
 
@@ -23,25 +39,703 @@ import rsa  # For digital signatures (install with `pip install rsa`)
 
 
 # Step 2: Define the Block class
+
+# Proof-of-work helpers shared by the single-core and multi-core mining paths
+MINING_CHECK_INTERVAL = 4096  # Nonces each worker tries between checks of the stop signal
+_mining_stop_event = None  # Set in every pool worker so the first winner can cancel the others
+
+def difficulty_bound(difficulty):
+    # A hash has `difficulty` leading hex zeros exactly when its digest, read as an integer, is below this bound
+    return 1 << (256 - 4 * difficulty)
+
+def _init_mining_worker(stop_event):
+    # Stores the shared stop signal in the pool worker process
+    global _mining_stop_event
+    _mining_stop_event = stop_event
+
+def _mine_nonce_stride(block_data, difficulty, start, step):
+    # Tries nonces start, start + step, start + 2 * step, ... until a valid hash is found or another worker wins
+    prefix_state = hashlib.sha256(block_data.encode())  # SHA-256 state after absorbing the block data once
+    bound = difficulty_bound(difficulty)
+    nonce = start
+    attempts = 0
+    while not _mining_stop_event.is_set():
+        for _ in range(MINING_CHECK_INTERVAL):
+            candidate = prefix_state.copy()
+            candidate.update(str(nonce).encode())
+            attempts += 1
+            if int.from_bytes(candidate.digest(), "big") < bound:
+                _mining_stop_event.set()  # Cancels the other workers
+                return nonce, candidate.hexdigest(), attempts
+            nonce += step
+    return None, None, attempts
+
+def _star_mine_nonce_stride(job):
+    # Unpacks a job tuple for Pool.imap_unordered
+    return _mine_nonce_stride(*job)
+
+# Merkle tree helpers: a block commits to the root, and one transaction can be proven with O(log n) hashes
+# Leaves and inner nodes use different prefixes so a transaction can never be passed off as an inner node
+def merkle_leaf_hash(transaction):
+    # Hashes one transaction into a Merkle leaf
+    return hashlib.sha256(b"\x00" + transaction.encode()).digest()
+
+def merkle_node_hash(left, right):
+    # Hashes two child nodes into their parent
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+def merkle_tree_levels(transaction_list):
+    # Builds every level of the tree, from the leaves up to the root; an odd last node is carried up unchanged
+    level = [merkle_leaf_hash(transaction) for transaction in transaction_list]
+    levels = [level]
+    while len(level) > 1:
+        level = [merkle_node_hash(level[i], level[i + 1]) if i + 1 < len(level) else level[i] for i in range(0, len(level), 2)]
+        levels.append(level)
+    return levels
+
+def merkle_root(transaction_list):
+    # Returns the hex Merkle root committing to every transaction in the list
+    if not transaction_list:
+        return hashlib.sha256(b"").hexdigest()
+    return merkle_tree_levels(transaction_list)[-1][0].hex()
+
+def verify_merkle_proof(transaction, proof, expected_root):
+    # Recomputes the root from a transaction and its proof of (sibling hash, side) pairs
+    node = merkle_leaf_hash(transaction)
+    for sibling_hash, side in proof:
+        sibling = bytes.fromhex(sibling_hash)
+        node = merkle_node_hash(sibling, node) if side == "left" else merkle_node_hash(node, sibling)
+    return node.hex() == expected_root
+
+class BlockList:
+    # In-memory chain with the same interface as BlockStore. Blocks are normally appended; replacing, deleting or
+    # inserting blocks is still possible, but calls on_change with the lowest height affected so the checkpoint rolls back.
+    def __init__(self, on_change):
+        self.blocks = []
+        self.on_change = on_change
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def __getitem__(self, key):
+        return self.blocks[key]
+
+    def __iter__(self):
+        return iter(self.blocks)
+
+    def append(self, block):
+        self.blocks.append(block)
+
+    def _first_height(self, key):
+        # Lowest height touched by an index or slice, as a non-negative height
+        if isinstance(key, slice):
+            return min(range(len(self.blocks))[key], default=key.indices(len(self.blocks))[0])
+        return range(len(self.blocks))[key]
+
+    def __setitem__(self, key, value):
+        height = self._first_height(key)
+        self.blocks[key] = value
+        self.on_change(height)
+
+    def __delitem__(self, key):
+        height = self._first_height(key)
+        del self.blocks[key]
+        self.on_change(height)
+
+    def insert(self, height, block):
+        height = min(max(height + len(self.blocks) if height < 0 else height, 0), len(self.blocks))
+        self.blocks.insert(height, block)
+        self.on_change(height)
+
+# Block fields checked by Blockchain.is_valid_chain; changing one rolls back the chain's validation checkpoint
+VALIDATED_FIELDS = {"previous_block_hash", "transaction_list", "merkle_root", "nonce", "block_data", "block_hash"}
+
 class Block:
     def __init__(self, previous_block_hash, transaction_list):
         self.previous_block_hash = previous_block_hash
         self.transaction_list = transaction_list
         self.nonce = 0
-        self.block_data = "-".join(transaction_list) + "-" + previous_block_hash
+        self.merkle_root = merkle_root(transaction_list)  # Fixed-size commitment to all transactions
+        self.block_data = self.merkle_root + "-" + previous_block_hash
         self.block_hash = self.calculate_hash()
+        self.chain_owner = None  # Blockchain this block was appended to
+        self.height = None  # Position of this block in its owner's chain
+
+    def __setattr__(self, name, value):
+        # Tells the owning chain when a validated field changes after the block was appended.
+        # Transactions are stored as a tuple so they cannot be edited in place behind this hook.
+        if name == "transaction_list":
+            value = tuple(value)
+        object.__setattr__(self, name, value)
+        owner = self.__dict__.get("chain_owner")
+        if owner is not None and name in VALIDATED_FIELDS:
+            owner.invalidate_from(self.height)
 
     def calculate_hash(self):
         # Generates the SHA-256 hash of the block data.
         return hashlib.sha256((self.block_data + str(self.nonce)).encode()).hexdigest()
 
-    def mine_block(self, difficulty):
+    def merkle_proof(self, transaction_index):
+        # Returns the (sibling hash, side) pairs proving transaction_list[transaction_index] is in this block
+        proof = []
+        index = transaction_index
+        for level in merkle_tree_levels(self.transaction_list)[:-1]:
+            sibling_index = index ^ 1
+            if sibling_index < len(level):
+                proof.append((level[sibling_index].hex(), "left" if sibling_index < index else "right"))
+            index //= 2
+        return proof
+
+    def mine_block(self, difficulty, workers=1):
         # Proof of Work: Finds a valid hash with leading zeros based on difficulty.
-        target = "0" * difficulty  # Hash must start with `difficulty` number of 0s
-        while self.block_hash[:difficulty] != target:
-            self.nonce += 1
-            self.block_hash = self.calculate_hash()
+        # With workers > 1 the nonce space is split across a process pool and the first winner stops the rest.
+        start_time = time.perf_counter()
+        if workers > 1:
+            attempts = self._mine_parallel(difficulty, workers)
+        else:
+            attempts = self._mine_serial(difficulty)
+        elapsed = time.perf_counter() - start_time
+        self.hash_count = attempts  # Hashes tried while mining
+        self.hash_rate = attempts / elapsed if elapsed > 0 else float("inf")  # Hashes per second
         print(f"Block mined: {self.block_hash}")
+        print(f"Hash rate: {self.hash_rate:,.0f} hashes/sec ({attempts} hashes in {elapsed:.3f}s)")
+
+    def _mine_serial(self, difficulty):
+        # Tries nonces one at a time on a single core, reusing the SHA-256 state of the block data
+        prefix_state = hashlib.sha256(self.block_data.encode())
+        bound = difficulty_bound(difficulty)
+        nonce = self.nonce
+        attempts = 0
+        while True:
+            candidate = prefix_state.copy()
+            candidate.update(str(nonce).encode())
+            attempts += 1
+            if int.from_bytes(candidate.digest(), "big") < bound:
+                self.nonce, self.block_hash = nonce, candidate.hexdigest()
+                return attempts
+            nonce += 1
+
+    def _mine_parallel(self, difficulty, workers):
+        # Worker i tries nonces nonce + i, nonce + i + workers, ... so no two workers repeat a hash
+        context = multiprocessing.get_context()
+        stop_event = context.Event()
+        jobs = [(self.block_data, difficulty, self.nonce + i, workers) for i in range(workers)]
+        attempts = 0
+        winner = None
+        with context.Pool(workers, initializer=_init_mining_worker, initargs=(stop_event,)) as pool:
+            for nonce, block_hash, worker_attempts in pool.imap_unordered(_star_mine_nonce_stride, jobs):
+                attempts += worker_attempts
+                if nonce is not None and (winner is None or nonce < winner[0]):
+                    winner = (nonce, block_hash)
+        self.nonce, self.block_hash = winner
+        return attempts
+
+
+
+
+
+
+# Compact block representation for holding millions of blocks in memory
+GENESIS_PREVIOUS_HASH = "0"  # The genesis block's previous hash, stored as 32 zero bytes
+COMPACT_HEADER = struct.Struct(">32s32sQ32s")  # Previous hash, Merkle root, nonce, block hash
+
+class CompactBlock:
+    # Memory-lean block: raw 32-byte digests, no per-instance __dict__ and no joined block_data copy.
+    # The hex properties follow the same hashing rule as Block, so both kinds of block validate the same way.
+    __slots__ = ("previous_digest", "merkle_digest", "nonce", "digest", "transaction_list")
+
+    def __init__(self, previous_digest, merkle_digest, nonce, digest, transaction_list):
+        self.previous_digest = previous_digest
+        self.merkle_digest = merkle_digest
+        self.nonce = nonce
+        self.digest = digest
+        self.transaction_list = tuple(transaction_list)
+
+    @classmethod
+    def from_block(cls, block):
+        # Packs a mined Block
+        previous_digest = bytes(32) if block.previous_block_hash == GENESIS_PREVIOUS_HASH else bytes.fromhex(block.previous_block_hash)
+        return cls(previous_digest, bytes.fromhex(block.merkle_root), block.nonce, bytes.fromhex(block.block_hash), block.transaction_list)
+
+    def to_block(self):
+        # Unpacks back into a regular Block
+        block = Block(self.previous_block_hash, list(self.transaction_list))
+        block.nonce = self.nonce
+        block.block_hash = self.block_hash
+        return block
+
+    @property
+    def previous_block_hash(self):
+        return GENESIS_PREVIOUS_HASH if self.previous_digest == bytes(32) else self.previous_digest.hex()
+
+    @property
+    def merkle_root(self):
+        return self.merkle_digest.hex()
+
+    @property
+    def block_hash(self):
+        return self.digest.hex()
+
+    @property
+    def block_data(self):
+        # Rebuilt on demand instead of being stored alongside the transactions
+        return self.merkle_root + "-" + self.previous_block_hash
+
+    def calculate_hash(self):
+        # Generates the SHA-256 hash of the block data.
+        return hashlib.sha256((self.block_data + str(self.nonce)).encode()).hexdigest()
+
+    def header_bytes(self):
+        # Fixed 104-byte binary header
+        return COMPACT_HEADER.pack(self.previous_digest, self.merkle_digest, self.nonce, self.digest)
+
+    @classmethod
+    def from_header_bytes(cls, header, transaction_list):
+        # Rebuilds a block from its binary header and its transactions
+        return cls(*COMPACT_HEADER.unpack(header), transaction_list)
+
+def compare_block_memory(count=10000, transactions_per_block=2):
+    # Measures the bytes still allocated per block for Block and CompactBlock holding the same transactions
+    results = {}
+    for name, build in (("Block", lambda block: block), ("CompactBlock", CompactBlock.from_block)):
+        tracemalloc.start()
+        blocks = []
+        for i in range(count):
+            transactions = [f"Resident{i} sends {t} NC to Resident{t}" for t in range(transactions_per_block)]
+            blocks.append(build(Block(format(i, "064x"), transactions)))
+        results[name] = tracemalloc.get_traced_memory()[0] / count
+        tracemalloc.stop()
+    return results
+
+
+
+
+
+
+# Persistent block storage: blocks are appended to a segment file and located through a memory-mapped index
+INDEX_MAGIC = b"NCIX"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct(">4sIQ")  # Magic, format version, last verified height
+INDEX_RECORD = struct.Struct(">QI32s")  # Segment file offset, record length, raw block hash
+
+# Hash -> height lookups go through a second memory-mapped file: an open-addressing hash table with linear probing.
+# Block hashes are SHA-256 digests, so their leading bytes already spread evenly over the slots.
+HASH_TABLE_MAGIC = b"NCHT"
+HASH_TABLE_VERSION = 1
+HASH_TABLE_HEADER = struct.Struct(">4sIQQ")  # Magic, format version, slot count, blocks entered
+HASH_SLOT = struct.Struct(">32sQ")  # Raw block hash, height + 1 (0 marks an empty slot)
+MIN_HASH_SLOTS = 1024
+
+def block_to_record(block):
+    # Serializes the fields needed to rebuild a mined block
+    return json.dumps({
+        "previous_block_hash": block.previous_block_hash,
+        "transaction_list": block.transaction_list,
+        "nonce": block.nonce,
+        "block_hash": block.block_hash,
+    }).encode()
+
+def block_from_record(data):
+    # Rebuilds a mined block from its serialized record
+    record = json.loads(data)
+    block = Block(record["previous_block_hash"], record["transaction_list"])
+    block.nonce = record["nonce"]
+    block.block_hash = record["block_hash"]
+    return block
+
+class BlockStore:
+    # Append-only block store that behaves like the chain list but only loads a block when it is accessed.
+    # Record i of the index holds block i's offset in the segment file, so opening a store reads no blocks.
+    def __init__(self, path, fsync=False):
+        self.index_path = path + ".index"
+        self.segment_path = path + ".blocks"
+        self.hash_path = path + ".hashes"
+        self.balances_path = path + ".balances"
+        self.fsync = fsync  # Forces every appended block to disk before append returns
+        if not os.path.exists(self.index_path):
+            with open(self.index_path, "wb") as index_file:
+                index_file.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, 0))
+        self.index_file = open(self.index_path, "r+b")
+        self.segment_file = open(self.segment_path, "a+b")
+        self.index = mmap.mmap(self.index_file.fileno(), 0)
+        magic, version, _ = INDEX_HEADER.unpack_from(self.index, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise ValueError(f"{self.index_path} is not a block store index")
+        self.block_count = (len(self.index) - INDEX_HEADER.size) // INDEX_RECORD.size
+        self._discard_torn_tail()
+        self.hash_file = None
+        self.hash_table = None
+        self._open_hash_table()
+
+    def _discard_torn_tail(self):
+        # Drops a partial index record or unindexed segment bytes left behind by a crash mid-append
+        index_size = INDEX_HEADER.size + self.block_count * INDEX_RECORD.size
+        segment_size = 0
+        if self.block_count:
+            offset, length, _ = self._index_record(self.block_count - 1)
+            segment_size = offset + length
+        if len(self.index) != index_size:
+            self.index.close()
+            self.index_file.truncate(index_size)
+            self.index = mmap.mmap(self.index_file.fileno(), 0)
+        if os.path.getsize(self.segment_path) != segment_size:
+            self.segment_file.truncate(segment_size)
+
+    def _index_record(self, height):
+        # Reads one index record, remapping first if the index file has grown past the current mapping
+        position = INDEX_HEADER.size + height * INDEX_RECORD.size
+        if position + INDEX_RECORD.size > len(self.index):
+            self.index.close()
+            self.index = mmap.mmap(self.index_file.fileno(), 0)
+        return INDEX_RECORD.unpack_from(self.index, position)
+
+    @property
+    def verified_height(self):
+        # Last height Blockchain.is_valid_chain accepted, kept across restarts
+        return INDEX_HEADER.unpack_from(self.index, 0)[2]
+
+    @verified_height.setter
+    def verified_height(self, height):
+        INDEX_HEADER.pack_into(self.index, 0, INDEX_MAGIC, INDEX_VERSION, height)
+
+    def __len__(self):
+        return self.block_count
+
+    def __getitem__(self, height):
+        # Loads the block at `height` from the segment file; negative heights count from the tip like a list
+        if height < 0:
+            height += self.block_count
+        if not 0 <= height < self.block_count:
+            raise IndexError("block height out of range")
+        offset, length, _ = self._index_record(height)
+        self.segment_file.seek(offset)
+        return block_from_record(self.segment_file.read(length))
+
+    def __iter__(self):
+        for height in range(self.block_count):
+            yield self[height]
+
+    def _open_hash_table(self):
+        # Maps the hash table, rebuilding it from the index if it is missing, foreign, or out of step after a crash
+        if os.path.exists(self.hash_path) and os.path.getsize(self.hash_path) >= HASH_TABLE_HEADER.size:
+            self.hash_file = open(self.hash_path, "r+b")
+            self.hash_table = mmap.mmap(self.hash_file.fileno(), 0)
+            magic, version, slot_count, entries = HASH_TABLE_HEADER.unpack_from(self.hash_table, 0)
+            if magic == HASH_TABLE_MAGIC and version == HASH_TABLE_VERSION and entries == self.block_count \
+                    and len(self.hash_table) == HASH_TABLE_HEADER.size + slot_count * HASH_SLOT.size:
+                return
+        self._rebuild_hash_table()
+
+    def _rebuild_hash_table(self):
+        # Writes a table with room for twice the stored blocks into a new file and swaps it in.
+        # Only needed on first use, on growth (amortised over the appends since the last one) and after a crash.
+        slot_count = MIN_HASH_SLOTS
+        while slot_count < 2 * (self.block_count + 1):
+            slot_count *= 2
+        new_path = self.hash_path + ".new"
+        with open(new_path, "w+b") as new_file:
+            new_file.truncate(HASH_TABLE_HEADER.size + slot_count * HASH_SLOT.size)
+            with mmap.mmap(new_file.fileno(), 0) as table:
+                for height in range(self.block_count):
+                    self._hash_insert(table, slot_count, self._index_record(height)[2], height)
+                HASH_TABLE_HEADER.pack_into(table, 0, HASH_TABLE_MAGIC, HASH_TABLE_VERSION, slot_count, self.block_count)
+                table.flush()
+            if self.fsync:
+                os.fsync(new_file.fileno())
+        if self.hash_table is not None:
+            self.hash_table.close()
+            self.hash_file.close()
+        os.replace(new_path, self.hash_path)
+        self.hash_file = open(self.hash_path, "r+b")
+        self.hash_table = mmap.mmap(self.hash_file.fileno(), 0)
+
+    @staticmethod
+    def _hash_probe(table, slot_count, raw_hash):
+        # Yields (position, stored hash, height + 1) for each slot on raw_hash's probe sequence, stopping at an empty one
+        slot = int.from_bytes(raw_hash[:8], "big") % slot_count
+        while True:
+            position = HASH_TABLE_HEADER.size + slot * HASH_SLOT.size
+            stored_hash, height_plus_one = HASH_SLOT.unpack_from(table, position)
+            yield position, stored_hash, height_plus_one
+            if not height_plus_one:
+                return
+            slot = (slot + 1) % slot_count
+
+    def _hash_insert(self, table, slot_count, raw_hash, height):
+        for position, stored_hash, height_plus_one in self._hash_probe(table, slot_count, raw_hash):
+            if not height_plus_one or stored_hash == raw_hash:
+                HASH_SLOT.pack_into(table, position, raw_hash, height + 1)
+                return
+
+    def get_by_hash(self, block_hash):
+        # Looks a block up by its hex hash through the memory-mapped hash table; returns None if it is not stored
+        raw_hash = bytes.fromhex(block_hash)
+        slot_count = HASH_TABLE_HEADER.unpack_from(self.hash_table, 0)[2]
+        for _, stored_hash, height_plus_one in self._hash_probe(self.hash_table, slot_count, raw_hash):
+            if height_plus_one and stored_hash == raw_hash:
+                return self[height_plus_one - 1]
+        return None
+
+    def append(self, block):
+        # Writes the block to the end of the segment file, then publishes it by appending its index record
+        data = block_to_record(block)
+        offset = self.segment_file.seek(0, os.SEEK_END)
+        self.segment_file.write(data)
+        self.segment_file.flush()
+        raw_hash = bytes.fromhex(block.block_hash)
+        self.index_file.seek(0, os.SEEK_END)
+        self.index_file.write(INDEX_RECORD.pack(offset, len(data), raw_hash))
+        self.index_file.flush()
+        if self.fsync:
+            os.fsync(self.segment_file.fileno())
+            os.fsync(self.index_file.fileno())
+        self.block_count += 1
+        # The hash table is written last: if a crash leaves it behind the index, reopening rebuilds it
+        _, _, slot_count, entries = HASH_TABLE_HEADER.unpack_from(self.hash_table, 0)
+        if 2 * (entries + 1) > slot_count:
+            self._rebuild_hash_table()
+        else:
+            self._hash_insert(self.hash_table, slot_count, raw_hash, self.block_count - 1)
+            HASH_TABLE_HEADER.pack_into(self.hash_table, 0, HASH_TABLE_MAGIC, HASH_TABLE_VERSION, slot_count, entries + 1)
+            if self.fsync:
+                self.hash_table.flush()
+
+    def save_balances(self, snapshot):
+        # Atomically replaces the stored BalanceIndex snapshot, tagged with the hash of the block it is valid at
+        record = dict(snapshot, block_hash=self._index_record(snapshot["height"])[2].hex())
+        new_path = self.balances_path + ".new"
+        with open(new_path, "w") as balances_file:
+            json.dump(record, balances_file)
+            balances_file.flush()
+            if self.fsync:
+                os.fsync(balances_file.fileno())
+        os.replace(new_path, self.balances_path)
+
+    def load_balances(self):
+        # Returns the stored BalanceIndex snapshot, or None if none has been saved yet
+        if not os.path.exists(self.balances_path):
+            return None
+        with open(self.balances_path) as balances_file:
+            snapshot = json.load(balances_file)
+        height = snapshot["height"]
+        if height >= self.block_count or self._index_record(height)[2].hex() != snapshot["block_hash"]:
+            raise ValueError(f"{self.balances_path} does not match the blocks in the store")
+        return snapshot
+
+    def close(self):
+        self.index.flush()
+        self.index.close()
+        self.index_file.close()
+        self.segment_file.close()
+        self.hash_table.flush()
+        self.hash_table.close()
+        self.hash_file.close()
+
+
+
+
+
+
+# Structured transactions and the account balance index
+Transfer = collections.namedtuple("Transfer", ["sender", "amount", "receiver"])
+TRANSFER_PATTERN = re.compile(r"^(?P<sender>.+?) sends (?P<amount>\d+) NC to (?P<receiver>.+)$")
+
+def parse_transaction(transaction):
+    # Turns "Anna sends 2 NC to Mike" into Transfer("Anna", 2, "Mike"); returns None for anything else
+    match = TRANSFER_PATTERN.match(transaction)
+    if match is None:
+        return None
+    return Transfer(match["sender"], int(match["amount"]), match["receiver"])
+
+def format_transaction(transfer):
+    # Turns a Transfer back into the transaction text stored in blocks
+    return f"{transfer.sender} sends {transfer.amount} NC to {transfer.receiver}"
+
+class BalanceIndex:
+    # Account balances kept up to date block by block, so a balance query never scans the chain
+    def __init__(self, opening_balances=None, height=0):
+        self.balances = dict(opening_balances or {})  # Account -> NC held as of `height`
+        self.height = height  # Last block height applied to the balances
+        self.pending_debits = {}  # Account -> NC reserved by admitted but not yet mined transfers
+        self.reserved = {}  # Transaction -> admitted copies holding a reservation, so only those are ever released
+
+    def balance(self, account):
+        # NC held by the account in the mined chain
+        return self.balances.get(account, 0)
+
+    def available(self, account):
+        # NC the account can still spend once its pending transfers are taken into account
+        return self.balance(account) - self.pending_debits.get(account, 0)
+
+    def reserve(self, transaction):
+        # Reserves the amount of a pending transfer; returns False if it would overdraw the sender
+        transfer = parse_transaction(transaction)
+        if transfer is None:
+            return True
+        if self.available(transfer.sender) < transfer.amount:
+            return False
+        self.pending_debits[transfer.sender] = self.pending_debits.get(transfer.sender, 0) + transfer.amount
+        self.reserved[transaction] = self.reserved.get(transaction, 0) + 1
+        return True
+
+    def release(self, transaction):
+        # Cancels the reservation of a transfer that was mined or left the mempool; transfers never reserved are ignored
+        copies = self.reserved.get(transaction, 0)
+        if not copies:
+            return
+        if copies > 1:
+            self.reserved[transaction] = copies - 1
+        else:
+            del self.reserved[transaction]
+        transfer = parse_transaction(transaction)
+        reserved = self.pending_debits.get(transfer.sender, 0) - transfer.amount
+        if reserved > 0:
+            self.pending_debits[transfer.sender] = reserved
+        else:
+            self.pending_debits.pop(transfer.sender, None)
+
+    def apply_block(self, block, height):
+        # Moves the NC of every transfer in a newly appended block and releases their reservations
+        for transaction in block.transaction_list:
+            transfer = parse_transaction(transaction)
+            if transfer is None:
+                continue
+            self.balances[transfer.sender] = self.balance(transfer.sender) - transfer.amount
+            self.balances[transfer.receiver] = self.balance(transfer.receiver) + transfer.amount
+            self.release(transaction)
+        self.height = height
+
+    def catch_up(self, chain):
+        # Applies every block above the index height, e.g. the tail of a chain reopened from a store
+        for height in range(self.height + 1, len(chain)):
+            self.apply_block(chain[height], height)
+
+    def snapshot(self):
+        # Returns the balances and the height they are valid at, ready for json.dump
+        return {"height": self.height, "balances": dict(self.balances)}
+
+    @classmethod
+    def from_snapshot(cls, snapshot, chain=None):
+        # Rebuilds the index from a snapshot, then applies the blocks mined after it
+        index = cls(snapshot["balances"], snapshot["height"])
+        if chain is not None:
+            index.catch_up(chain)
+        return index
+
+
+
+
+
+
+# Fee-prioritised, size-bounded mempool
+class Mempool:
+    # Pending transactions ordered by fee (highest first) and then age (oldest first).
+    # Two heaps give O(log n) admission, O(log n) eviction of the worst entry and O(k log n) block templates.
+    def __init__(self, max_size=10000, max_block_transactions=500, on_evict=None):
+        self.max_size = max_size  # Pending transactions kept before low-fee ones are evicted
+        self.max_block_transactions = max_block_transactions  # Upper bound on transactions per mined block
+        self.on_evict = on_evict  # Called with each transaction pushed out by a higher-fee one
+        self.entries = {}  # Arrival sequence -> (transaction, fee)
+        self.best = []  # Heap of (-fee, sequence): the next transaction to mine is at the top
+        self.worst = []  # Heap of (fee, -sequence): the next transaction to evict is at the top
+        self.sequence = itertools.count()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _peek(self, heap, key):
+        # Drops heap entries already mined or evicted and returns the live top, or None
+        while heap and key(heap[0]) not in self.entries:
+            heapq.heappop(heap)
+        return key(heap[0]) if heap else None
+
+    def add(self, transaction, fee=0):
+        # Queues a transaction; when full it must outbid the cheapest pending one. Returns True if queued.
+        if len(self.entries) >= self.max_size:
+            worst_sequence = self._peek(self.worst, lambda entry: -entry[1])
+            if worst_sequence is None or fee <= self.entries[worst_sequence][1]:
+                return False
+            evicted_transaction, _ = self.entries.pop(worst_sequence)
+            if self.on_evict is not None:
+                self.on_evict(evicted_transaction)
+        sequence = next(self.sequence)
+        self.entries[sequence] = (transaction, fee)
+        heapq.heappush(self.best, (-fee, sequence))
+        heapq.heappush(self.worst, (fee, -sequence))
+        if len(self.best) + len(self.worst) > 4 * len(self.entries) + 64:
+            self._compact()
+        return True
+
+    def _compact(self):
+        # Rebuilds both heaps without the stale entries left behind by lazy deletion
+        self.best = [(-fee, sequence) for sequence, (_, fee) in self.entries.items()]
+        self.worst = [(fee, -sequence) for sequence, (_, fee) in self.entries.items()]
+        heapq.heapify(self.best)
+        heapq.heapify(self.worst)
+
+    def select_block_template(self, limit=None):
+        # Removes and returns up to `limit` (default max_block_transactions) transactions, best first
+        limit = self.max_block_transactions if limit is None else limit
+        selected = []
+        while len(selected) < limit:
+            sequence = self._peek(self.best, lambda entry: entry[1])
+            if sequence is None:
+                break
+            heapq.heappop(self.best)
+            selected.append(self.entries.pop(sequence)[0])
+        return selected
+
+    def transactions(self):
+        # All pending transactions in mining order
+        return [self.entries[sequence][0] for _, sequence in sorted((-fee, sequence) for sequence, (_, fee) in self.entries.items())]
+
+async def serve_mempool(blockchain, host="127.0.0.1", port=0, allow_unsigned=False):
+    # Starts an asyncio server that feeds one JSON transaction per line into the blockchain's mempool.
+    # Lines look like {"transaction": ..., "fee": 3, "signature": <hex>, "public_key": <PEM>}; they go through
+    # admit_transactions, so signatures and overdrafts are checked. Unsigned lines are only accepted with allow_unsigned.
+    # Admission (RSA verification, possibly a blocking pool map) runs on one worker thread: the event loop keeps serving
+    # other connections, and admissions still reach the mempool one at a time. Mining may run at the same time on the
+    # loop thread; Blockchain.mempool_lock keeps the two from changing the mempool and reservations at once.
+    # The worker thread belongs to this server and is shut down once the server has closed.
+    admission_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    async def admit(record):
+        loop = asyncio.get_running_loop()
+        if "signature" in record:
+            signed = (record["transaction"], bytes.fromhex(record["signature"]), record["public_key"].encode())
+            return (await loop.run_in_executor(admission_executor, blockchain.admit_transactions, [signed], [record.get("fee", 0)]))[0]
+        if allow_unsigned:
+            return await loop.run_in_executor(admission_executor, blockchain.add_transaction, record["transaction"], record.get("fee", 0))
+        return False  # Unsigned transactions are refused unless explicitly allowed
+
+    async def handle_client(reader, writer):
+        while line := await reader.readline():
+            try:
+                accepted = await admit(json.loads(line))
+            except (ValueError, KeyError, TypeError):
+                accepted = False  # Malformed line
+            writer.write(b"ACCEPTED\n" if accepted else b"REJECTED\n")
+            await writer.drain()
+        writer.close()
+
+    async def shut_down_executor(server):
+        await server.wait_closed()
+        admission_executor.shutdown(wait=False)  # Lets admissions already queued finish without blocking the loop
+
+    server = await asyncio.start_server(handle_client, host, port)
+    server.executor_shutdown = asyncio.create_task(shut_down_executor(server))  # Kept on the server so the task is not collected
+    return server
+
+async def send_transactions(host, port, records):
+    # Local client for serve_mempool: streams JSON records and returns the server's replies
+    reader, writer = await asyncio.open_connection(host, port)
+    for record in records:
+        writer.write(json.dumps(record).encode() + b"\n")
+    await writer.drain()
+    replies = [(await reader.readline()).decode().strip() for _ in records]
+    writer.close()
+    await writer.wait_closed()
+    return replies
 
 
 
@@ -49,43 +743,158 @@ class Block:
 
 
 # Step 3: Define the Blockchain class
+BALANCE_SNAPSHOT_INTERVAL = 100  # Blocks mined between balance snapshots saved to a block store
+
 class Blockchain:
-    def __init__(self, difficulty=2):
-        self.chain = [self.create_genesis_block()]
-        self.pending_transactions = []
+    def __init__(self, difficulty=2, mining_workers=1, store=None, verifier=None, balance_index=None, reject_overdrafts=False, mempool=None, account_keys=None):
+        # With a BlockStore the chain lives on disk and reopening it resumes from the stored blocks
+        self.store = store
+        self.chain = BlockList(self.blocks_changed) if store is None else store  # Both are append-only from the chain's side
+        self.verified_height = 0 if store is None else store.verified_height  # Highest block height already checked by is_valid_chain
+        if not self.chain:
+            self.append_block(self.create_genesis_block())
         self.difficulty = difficulty  # Adjust mining difficulty
+        self.mining_workers = mining_workers  # Number of CPU cores used for proof-of-work
+        self.verifier = verifier or SignatureVerifier(workers=1)  # Checks signatures before transactions are admitted
+        # Account balances, updated as blocks are mined. A reopened store resumes from its saved snapshot, so only the
+        # blocks mined after it are loaded
+        if balance_index is None and store is not None and (snapshot := store.load_balances()) is not None:
+            balance_index = BalanceIndex.from_snapshot(snapshot)
+        self.balance_index = balance_index or BalanceIndex()
+        self.balance_index.catch_up(self.chain)
+        if store is not None:
+            self.save_balances()
+        self.reject_overdrafts = reject_overdrafts  # Refuse transfers the sender cannot cover at admission time
+        # Account -> public key allowed to spend from it. A signature only proves that some key signed the text, so a
+        # transfer is only admitted if it is signed by its sender's key; with reject_overdrafts, unregistered senders
+        # are refused too, otherwise anyone could spend a registered balance by naming its owner as sender
+        self.account_keys = {account: load_public_key(key) for account, key in (account_keys or {}).items()}
+        self.mempool = Mempool() if mempool is None else mempool  # Pending transactions, mined highest fee first
+        self.mempool.on_evict = self.balance_index.release
+        self.mempool_lock = threading.Lock()  # Held while the mempool or the balance reservations change
 
     def create_genesis_block(self):
         # Creates the first block with a default 'Genesis Block'
         return Block("0", ["Genesis Block"])
 
-    def add_transaction(self, transaction):
-        # Adds a transaction to the pending transaction pool
-        self.pending_transactions.append(transaction)
+    def append_block(self, block):
+        # Appends a block and registers the chain as its owner so later edits roll back the checkpoint
+        block.height = len(self.chain)
+        block.chain_owner = self
+        self.chain.append(block)
+
+    def blocks_changed(self, height):
+        # Blocks from `height` up were replaced, removed or shifted: re-register them and re-check from there
+        for shifted_height in range(height, len(self.chain)):
+            block = self.chain[shifted_height]
+            block.height = shifted_height
+            block.chain_owner = self
+        self.invalidate_from(height)
+
+    def invalidate_from(self, height):
+        # A change at `height` means that block and its link to the next one must be checked again
+        self.set_verified_height(max(0, min(self.verified_height, height - 1)))
+
+    def set_verified_height(self, height):
+        # Moves the validation checkpoint, persisting it when the chain is backed by a store
+        self.verified_height = height
+        if self.store is not None:
+            self.store.verified_height = height
+
+    @property
+    def pending_transactions(self):
+        # Transactions waiting in the mempool, in the order they would be mined
+        with self.mempool_lock:
+            return self.mempool.transactions()
+
+    def add_transaction(self, transaction, fee=0):
+        # Adds a transaction from a trusted local caller to the pending transaction pool, without a signature check.
+        # Returns False if the full pool outbids it or, with reject_overdrafts, if the sender cannot cover it.
+        with self.mempool_lock:
+            if self.reject_overdrafts and not self.balance_index.reserve(transaction):
+                return False
+            if not self.mempool.add(transaction, fee):
+                self.balance_index.release(transaction)
+                return False
+            return True
+
+    def register_account(self, account, public_key):
+        # Binds an account to the key that must sign its transfers
+        self.account_keys[account] = load_public_key(public_key)
+
+    def signed_by_sender(self, transaction, public_key):
+        # True if the transaction may be signed by public_key: non-transfers always, transfers only by the sender's key
+        transfer = parse_transaction(transaction)
+        if transfer is None:
+            return True
+        registered_key = self.account_keys.get(transfer.sender)
+        if registered_key is None:
+            return not self.reject_overdrafts
+        return registered_key == load_public_key(public_key)
+
+    def admit_transactions(self, signed_transactions, fees=None):
+        # Verifies a batch of (transaction, signature, public key) tuples and only queues the validly signed ones
+        signed_transactions = list(signed_transactions)  # Iterated twice below, so a generator must be read only once
+        results = self.verifier.verify_batch(signed_transactions)
+        with self.mempool_lock:
+            for i, (transaction, _, public_key) in enumerate(signed_transactions):
+                if results[i] and not self.signed_by_sender(transaction, public_key):
+                    results[i] = False  # Signed by a key that does not own the sending account
+                elif results[i] and self.reject_overdrafts and not self.balance_index.reserve(transaction):
+                    results[i] = False  # Sender cannot cover the transfer
+                elif results[i] and not self.mempool.add(transaction, fees[i] if fees else 0):
+                    results[i] = False  # Mempool is full of higher-fee transactions
+                    if self.reject_overdrafts:
+                        self.balance_index.release(transaction)
+        return results
 
     def mine_pending_transactions(self):
-        # Mines a new block containing pending transactions and adds it to the chain
-        if not self.pending_transactions:
+        # Mines a new block from the highest-fee pending transactions and adds it to the chain
+        with self.mempool_lock:
+            transactions = self.mempool.select_block_template()
+        if not transactions:
             print("No transactions to mine.")
             return
         
-        new_block = Block(self.chain[-1].block_hash, self.pending_transactions)
-        new_block.mine_block(self.difficulty) # Perform proof-of-work mining
-        self.chain.append(new_block)
-        self.pending_transactions = [] # Clear transactions after mining
+        new_block = Block(self.chain[-1].block_hash, transactions)
+        new_block.mine_block(self.difficulty, self.mining_workers) # Perform proof-of-work mining
+        with self.mempool_lock:
+            self.append_block(new_block)
+            self.balance_index.apply_block(new_block, len(self.chain) - 1)
+        if self.store is not None and self.balance_index.height % BALANCE_SNAPSHOT_INTERVAL == 0:
+            self.save_balances()
+
+    def save_balances(self):
+        # Saves the balance index next to the block store
+        self.store.save_balances(self.balance_index.snapshot())
+
+    def close(self):
+        # Saves a final balance snapshot and closes the block store
+        if self.store is not None:
+            self.save_balances()
+            self.store.close()
 
-    def is_valid_chain(self):
+    def is_valid_chain(self, full_audit=False):
         # Checks the blockchain's integrity
-        for i in range(1, len(self.chain)):
+        # By default only blocks above the last verified height are checked; full_audit rechecks from block 1.
+        start = 1 if full_audit else min(self.verified_height, len(self.chain) - 1) + 1
+        for i in range(start, len(self.chain)):
             current_block = self.chain[i]
             previous_block = self.chain[i - 1]
 
             if current_block.block_hash != hashlib.sha256((current_block.block_data + str(current_block.nonce)).encode()).hexdigest():
+                self.invalidate_from(i)
                 return False # Block data has been tampered with
 
+            if current_block.block_data != merkle_root(current_block.transaction_list) + "-" + current_block.previous_block_hash:
+                self.invalidate_from(i)
+                return False # Transactions do not match the committed Merkle root
+
             if current_block.previous_block_hash != previous_block.block_hash:
+                self.invalidate_from(i)
                 return False # Chain is broken
 
+        self.set_verified_height(len(self.chain) - 1)
         return True
 
 
@@ -111,6 +920,64 @@ def verify_transaction(public_key, transaction, signature):
     except:
         return False
 
+@functools.lru_cache(maxsize=4096)
+def parse_public_key(key_bytes):
+    # Parses a PEM or DER encoded public key once; repeat senders hit the cache
+    key_format = "PEM" if key_bytes.lstrip().startswith(b"-----") else "DER"
+    return rsa.PublicKey.load_pkcs1(key_bytes, key_format)
+
+def load_public_key(public_key):
+    # Accepts either an rsa.PublicKey or its PEM/DER encoding
+    return public_key if isinstance(public_key, rsa.PublicKey) else parse_public_key(bytes(public_key))
+
+def _verify_signature_chunk(signed_transactions):
+    # Verifies one chunk of (transaction, signature, public key) tuples inside a pool worker
+    results = []
+    for transaction, signature, public_key in signed_transactions:
+        try:
+            results.append(verify_transaction(load_public_key(public_key), transaction, signature))
+        except Exception:
+            results.append(False)  # Unparseable public key
+    return results
+
+class SignatureVerifier:
+    # Verifies batches of signed transactions across a process pool and keeps throughput metrics
+    def __init__(self, workers=None, chunk_size=256):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size  # Signatures sent to a worker per task
+        self.pool = None  # Started on the first batch large enough to split
+        self.accepted_count = 0
+        self.rejected_count = 0
+        self.verify_seconds = 0.0
+
+    def verify_batch(self, signed_transactions):
+        # Returns one True/False per tuple, in input order
+        start_time = time.perf_counter()
+        signed_transactions = list(signed_transactions)
+        if self.workers == 1 or len(signed_transactions) <= self.chunk_size:
+            results = _verify_signature_chunk(signed_transactions)
+        else:
+            if self.pool is None:
+                self.pool = multiprocessing.get_context().Pool(self.workers)
+            chunks = [signed_transactions[i:i + self.chunk_size] for i in range(0, len(signed_transactions), self.chunk_size)]
+            results = [valid for chunk_results in self.pool.map(_verify_signature_chunk, chunks) for valid in chunk_results]
+        self.verify_seconds += time.perf_counter() - start_time
+        accepted = sum(results)
+        self.accepted_count += accepted
+        self.rejected_count += len(results) - accepted
+        return results
+
+    def throughput(self):
+        # Signatures verified per second across all batches so far
+        total = self.accepted_count + self.rejected_count
+        return total / self.verify_seconds if self.verify_seconds > 0 else 0.0
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
 
 
 
@@ -120,46 +987,107 @@ def verify_transaction(public_key, transaction, signature):
 
 # Step 5: Testing the Blockchain Implementation
 
-# Generate keys for users
-(public_key_A, private_key_A) = generate_keys()
-(public_key_B, private_key_B) = generate_keys()
-
-# Create a blockchain instance
-my_blockchain = Blockchain()
-
-# Create and sign transactions
-t1 = "Anna sends 2 NC to Mike"
-signature_t1 = sign_transaction(private_key_A, t1)
-print(f"Transaction Verified? {verify_transaction(public_key_A, t1, signature_t1)}")
-
-t2 = "Bob sends 4 NC to Mike"
-signature_t2 = sign_transaction(private_key_B, t2)
-print(f"Transaction Verified? {verify_transaction(public_key_B, t2, signature_t2)}")
-
-# Add transactions to the blockchain
-my_blockchain.add_transaction(t1)
-my_blockchain.add_transaction(t2)
-
-# Mine a new block
-print("\nMining transactions...")
-my_blockchain.mine_pending_transactions()
-
-# Add another transaction
-t3 = "Harry sends 10 NC to Charlie"
-my_blockchain.add_transaction(t3)
-
-# Mine another block
-print("\nMining new transactions...")
-my_blockchain.mine_pending_transactions()
-
-# Print blockchain details
-print("\nBlockchain:")
-for i, block in enumerate(my_blockchain.chain):
-    print(f"Block {i}:")
-    print(f"Transactions: {block.transaction_list}")
-    print(f"Block Hash: {block.block_hash}")
-    print(f"Previous Hash: {block.previous_block_hash}")
-    print("------")
-
-# Validate the blockchain
-print("\nIs blockchain valid?", my_blockchain.is_valid_chain())
+if __name__ == "__main__":
+
+    # Generate keys for users
+    (public_key_A, private_key_A) = generate_keys()
+    (public_key_B, private_key_B) = generate_keys()
+
+    # Create a blockchain instance that mines on every available CPU core and refuses overdrafts
+    opening_balances = {"Anna": 10, "Bob": 10, "Harry": 20}
+    my_blockchain = Blockchain(mining_workers=os.cpu_count() or 1, balance_index=BalanceIndex(opening_balances), reject_overdrafts=True,
+                               account_keys={"Anna": public_key_A, "Bob": public_key_B})
+
+    # Create and sign transactions
+    t1 = "Anna sends 2 NC to Mike"
+    signature_t1 = sign_transaction(private_key_A, t1)
+    print(f"Transaction Verified? {verify_transaction(public_key_A, t1, signature_t1)}")
+
+    t2 = "Bob sends 4 NC to Mike"
+    signature_t2 = sign_transaction(private_key_B, t2)
+    print(f"Transaction Verified? {verify_transaction(public_key_B, t2, signature_t2)}")
+
+    # Admit the signed transactions to the blockchain; the forged one is rejected before it reaches the pool,
+    # and so is a transfer out of Anna's account that Bob signed with his own key
+    forged = ("Mike sends 50 NC to Bob", signature_t1, public_key_A)
+    overdraft = "Anna sends 500 NC to Mike"
+    impersonation = "Anna sends 3 NC to Bob"
+    admitted = my_blockchain.admit_transactions([
+        (t1, signature_t1, public_key_A),
+        (t2, signature_t2, public_key_B),
+        forged,
+        (overdraft, sign_transaction(private_key_A, overdraft), public_key_A),
+        (impersonation, sign_transaction(private_key_B, impersonation), public_key_B),
+    ])
+    print(f"Admitted: {admitted}, pending: {my_blockchain.pending_transactions}")
+    print(f"Verifier throughput: {my_blockchain.verifier.throughput():,.0f} signatures/sec")
+
+    # Mine a new block
+    print("\nMining transactions...")
+    my_blockchain.mine_pending_transactions()
+
+    # Add another transaction
+    t3 = "Harry sends 10 NC to Charlie"
+    my_blockchain.add_transaction(t3)
+
+    # Mine another block
+    print("\nMining new transactions...")
+    my_blockchain.mine_pending_transactions()
+
+    # Print blockchain details
+    print("\nBlockchain:")
+    for i, block in enumerate(my_blockchain.chain):
+        print(f"Block {i}:")
+        print(f"Transactions: {block.transaction_list}")
+        print(f"Merkle Root: {block.merkle_root}")
+        print(f"Block Hash: {block.block_hash}")
+        print(f"Previous Hash: {block.previous_block_hash}")
+        print("------")
+
+    # Query balances from the index instead of scanning every block
+    print("\nBalances:", {account: my_blockchain.balance_index.balance(account) for account in ["Anna", "Bob", "Harry", "Mike", "Charlie"]})
+
+    # Compare the memory footprint of regular and compact blocks
+    for name, bytes_per_block in compare_block_memory(count=2000).items():
+        print(f"{name}: {bytes_per_block:,.0f} bytes per block")
+
+    # Validate the blockchain (incrementally, then with a full audit from block 1)
+    print("\nIs blockchain valid?", my_blockchain.is_valid_chain())
+    print("Full audit passed?", my_blockchain.is_valid_chain(full_audit=True))
+
+    # Persist the chain to an append-only block store and reopen it without re-mining
+    store_path = os.path.join(tempfile.mkdtemp(), "neighborhood_coins")
+    stored_blockchain = Blockchain(store=BlockStore(store_path))
+    stored_blockchain.add_transaction(t1)
+    stored_blockchain.mine_pending_transactions()
+    stored_blockchain.is_valid_chain()
+    stored_blockchain.close()
+    reopened_blockchain = Blockchain(store=BlockStore(store_path))
+    print("Reopened store height:", len(reopened_blockchain.chain) - 1, "verified up to:", reopened_blockchain.verified_height)
+    print("Lookup by hash:", reopened_blockchain.store.get_by_hash(reopened_blockchain.chain[-1].block_hash).transaction_list)
+    print("Balances restored from the snapshot:", reopened_blockchain.balance_index.balances)
+    reopened_blockchain.close()
+
+    # Prove a single transaction is in block 1 without rehashing the whole block
+    proof = my_blockchain.chain[1].merkle_proof(1)
+    print("Merkle proof for t2:", proof)
+    print("t2 included in block 1?", verify_merkle_proof(t2, proof, my_blockchain.chain[1].merkle_root))
+
+    # Stream a burst of transactions into a bounded mempool over a local socket, then mine bounded blocks
+    async def ingestion_demo():
+        burst_blockchain = Blockchain(mempool=Mempool(max_size=40, max_block_transactions=10))
+        server = await serve_mempool(burst_blockchain, allow_unsigned=True)  # A trusted local feed of unsigned transfers
+        port = server.sockets[0].getsockname()[1]
+        burst = [{"transaction": f"Resident{i} sends 1 NC to Resident{i + 1}", "fee": i % 7} for i in range(60)]
+        replies = await send_transactions("127.0.0.1", port, burst)
+        server.close()
+        await server.wait_closed()
+        print(f"\nBurst: {replies.count('ACCEPTED')} accepted, {replies.count('REJECTED')} rejected by the full mempool")
+        while len(burst_blockchain.mempool):
+            burst_blockchain.mine_pending_transactions()
+        print("Transactions per mined block:", [len(block.transaction_list) for block in burst_blockchain.chain[1:]])
+    asyncio.run(ingestion_demo())
+
+    # Tamper with an earlier block: the checkpoint rolls back and validation fails
+    my_blockchain.chain[1].transaction_list = ["Anna sends 200 NC to Mike", t2]
+    print("Is blockchain valid after tampering?", my_blockchain.is_valid_chain())
@@ -12,15 +12,22 @@
 # Import the libraries 
 import requests
 from bs4 import BeautifulSoup as bs
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse, unquote_plus, urlsplit, urlunsplit, parse_qsl, urlencode
+import argparse
+import collections
+import concurrent.futures
+import http.server
+import json
+import threading
+import time
 
 # Initialize an HTTP session with a user-agent to mimic a browser
 s = requests.Session()
 s.headers["User-Agent"] = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/83.0.4103.106 Safari/537.36"
 
 # Function that fetches all forms from the given URL using BeautifulSoup
-def get_all_forms(url):
-    soup = bs(s.get(url).content, "html.parser")
+def get_all_forms(url, session=s, timeout=None):
+    soup = bs(session.get(url, timeout=timeout).content, "html.parser")
     return soup.find_all("form")
 
 # Function that extracts and returns form details such as action, method and inputs
@@ -37,37 +44,355 @@ def get_form_details(form):
 # Function that checks for common SQL error messages in the response indicating vulnerability
 def is_vulnerable(response):
     errors = {"you have an error in your sql syntax;", "warning: mysql", "unclosed quotation mark", "quoted string not properly terminated"}
-    return any(error in response.content.decode().lower() for error in errors)
+    return any(error in response.content.decode(errors="replace").lower() for error in errors)
 
-# Function that performs SQL injection scan on the URL and its forms
-def scan_sql_injection(url):
-    # Test for URL-based SQL Injection
+# Function that sends one probe request; the probe functions below take it (or a wrapper around it) as `send`
+def send_probe(session, method, target_url, data, timeout=None):
+    return session.post(target_url, data=data, timeout=timeout) if method == "post" else session.get(target_url, params=data, timeout=timeout)
+
+# Function that tests the URL itself by appending quotes; returns the vulnerable URL or None
+def probe_url(url, send, log=None):
+    log = log or (lambda message: None)
     for c in "\"'":
         test_url = f"{url}{c}"
-        print(f"[!] Trying {test_url}")
-        if is_vulnerable(s.get(test_url)):
-            print(f"[+] SQL Injection vulnerability detected at {test_url}")
-            return
+        log(f"[!] Trying {test_url}")
+        if is_vulnerable(send("get", test_url, None)):
+            log(f"[+] SQL Injection vulnerability detected at {test_url}")
+            return test_url
+    return None
+
+# Function that submits a form with quotes injected into its inputs; returns the vulnerable action URL or None
+def probe_form(page_url, form_details, send, log=None):
+    log = log or (lambda message: None)
+    target_url = urljoin(page_url, form_details['action'])
+    for c in "\"'":
+        # Prepare data payload by injecting test input
+        data = {i['name']: (i['value'] + c if i['type'] == 'hidden' or i['value'] else f"test{c}") for i in form_details['inputs'] if i.get('name')}
+        if is_vulnerable(send(form_details['method'], target_url, data)):
+            log(f"[+] SQL Injection vulnerability detected at {target_url}")
+            log(f"[+] Form Details: {form_details}")
+            return target_url
+    return None
+
+# Function that probes one URL and its forms, returning a result record instead of printing.
+# Each request gets `timeout` seconds; once `deadline` (a time.monotonic() value) passes, the remaining probes are skipped.
+def probe_target(url, session=s, timeout=None, deadline=None, log=None):
+    log = log or (lambda message: None)
+    result = {"url": url, "vulnerable": False, "requests": 0}
+
+    def remaining_timeout():
+        # The per-request timeout, shortened so no request can run past the target's deadline
+        if deadline is None:
+            return timeout
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"Target deadline passed after {result['requests']} requests")
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def send(method, target_url, data):
+        request_timeout = remaining_timeout()
+        result["requests"] += 1
+        return send_probe(session, method, target_url, data, request_timeout)
+
+    # Test for URL-based SQL Injection
+    location = probe_url(url, send, log)
+    if location:
+        result.update(vulnerable=True, location=location)
+        return result
 
     # Extracts forms for further testing
-    forms = get_all_forms(url)
-    print(f"[+] Detected {len(forms)} forms on {url}.")
+    forms = get_all_forms(url, session, remaining_timeout())
+    result["requests"] += 1
+    log(f"[+] Detected {len(forms)} forms on {url}.")
 
     # Tests forms for SQL Injection
     for form in forms:
         form_details = get_form_details(form)
-        for c in "\"'":
-            # Prepare data payload by injecting test input
-            data = {i['name']: (i['value'] + c if i['type'] == 'hidden' or i['value'] else f"test{c}") for i in form_details['inputs'] if i.get('name')}
-            target_url = urljoin(url, form_details['action'])
-            res = s.post(target_url, data=data) if form_details['method'] == 'post' else s.get(target_url, params=data)
-            
-            if is_vulnerable(res):
-                print(f"[+] SQL Injection vulnerability detected at {target_url}")
-                print(f"[+] Form Details: {form_details}")
-                return
+        location = probe_form(url, form_details, send, log)
+        if location:
+            result.update(vulnerable=True, location=location, form=form_details)
+            return result
+    return result
+
+# Function that performs SQL injection scan on the URL and its forms
+def scan_sql_injection(url):
+    probe_target(url, log=print)
+
+# Concurrent scanning engine
+# Targets are probed on a bounded thread pool, so at most `max_in_flight` requests are outstanding at any time.
+# requests.Session is not safe to share between threads, so each worker thread keeps its own session; its connection
+# pool keeps one keep-alive connection per host open, so repeated probes of a host skip the TCP and TLS handshakes.
+# Results are yielded as soon as each target finishes, in completion order, not submission order.
+_worker_sessions = threading.local()
+
+def _worker_session():
+    session = getattr(_worker_sessions, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update(s.headers)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=64, pool_maxsize=1)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _worker_sessions.session = session
+    return session
+
+def _scan_one(url, timeout, target_timeout):
+    start_time = time.monotonic()
+    try:
+        result = probe_target(url, _worker_session(), timeout, start_time + target_timeout)
+    except (requests.RequestException, TimeoutError) as error:
+        result = {"url": url, "vulnerable": False, "error": f"{type(error).__name__}: {error}"}
+    result["seconds"] = round(time.monotonic() - start_time, 3)
+    return result
+
+def scan_targets(urls, max_in_flight=32, timeout=10, target_timeout=60):
+    # Yields one result record per target as soon as it is ready
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        pending = set()
+        for url in urls:
+            # Keeps the number of queued targets bounded so a huge target list is read lazily
+            if len(pending) >= 2 * max_in_flight:
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                yield from (future.result() for future in done)
+            pending.add(executor.submit(_scan_one, url, timeout, target_timeout))
+        for future in concurrent.futures.as_completed(pending):
+            yield future.result()
+
+# Crawler
+# Pages are fetched breadth-first from a frontier queue, up to max_depth links away from the seeds and max_pages in
+# total. Every URL is canonicalized before it is queued, so spellings of the same page are fetched once, and only URLs
+# on the seeds' hosts (or allowed_hosts), under one of path_prefixes and not pointing at static files are followed.
+# The same scope applies to redirect targets and to form actions, so no probe is ever sent outside it.
+# Template-heavy sites repeat the same login and search forms on every page, so each form is reduced to a fingerprint
+# of its resolved action, method and input names/types, and each fingerprint is probed exactly once. Query-string URLs
+# are deduplicated the same way by path and parameter names, so /item?id=1 ... /item?id=1000 is probed once.
+DEFAULT_PORTS = {"http": 80, "https": 443}
+STATIC_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".css", ".js", ".pdf", ".zip", ".woff", ".woff2", ".mp4")
+
+def remove_dot_segments(path):
+    segments = []
+    for segment in path.split("/"):
+        if segment == "..":
+            if len(segments) > 1:
+                segments.pop()
+        elif segment != ".":
+            segments.append(segment)
+    if path.endswith(("/.", "/..")):
+        segments.append("")
+    return "/".join(segments)
+
+def canonicalize_url(url):
+    # Lower-cases scheme and host, drops default ports and fragments, resolves "." and ".." and sorts the query
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    netloc = host if parts.port in (None, DEFAULT_PORTS.get(scheme)) else f"{host}:{parts.port}"
+    path = remove_dot_segments(parts.path) or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+def form_fingerprint(page_url, form_details):
+    action = canonicalize_url(urljoin(page_url, form_details["action"]))
+    inputs = tuple(sorted((i["name"] or "", i["type"]) for i in form_details["inputs"]))
+    return action, form_details["method"], inputs
+
+def url_fingerprint(url):
+    # Canonical URL without parameter values
+    parts = urlsplit(url)
+    return parts.scheme, parts.netloc, parts.path, tuple(sorted({name for name, _ in parse_qsl(parts.query, keep_blank_values=True)}))
+
+def _fetch_page(url, timeout):
+    # Returns (final URL, links, form details) for an HTML page
+    response = _worker_session().get(url, timeout=timeout, allow_redirects=False)
+    if response.is_redirect:
+        # Redirects are not followed here; the target goes through the same scope check as any other link
+        return response.url, [urljoin(response.url, response.headers["Location"])], []
+    if "html" not in response.headers.get("Content-Type", ""):
+        return response.url, [], []
+    soup = bs(response.content, "html.parser")
+    links = [urljoin(response.url, a["href"]) for a in soup.find_all("a", href=True)]
+    return response.url, links, [get_form_details(form) for form in soup.find_all("form")]
+
+def _probe_url_job(url, timeout):
+    return probe_url(url, lambda method, target_url, data: send_probe(_worker_session(), method, target_url, data, timeout))
+
+def _probe_form_job(page_url, form_details, timeout):
+    return probe_form(page_url, form_details, lambda method, target_url, data: send_probe(_worker_session(), method, target_url, data, timeout))
+
+class Crawler:
+    def __init__(self, seeds, max_depth=2, max_pages=500, allowed_hosts=None, path_prefixes=("/",), max_in_flight=32, timeout=10):
+        self.seeds = [canonicalize_url(seed) for seed in seeds]
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.allowed_hosts = set(allowed_hosts or (urlsplit(seed).netloc for seed in self.seeds))
+        self.path_prefixes = tuple(path_prefixes)
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.frontier = collections.deque()  # (canonical URL, depth) waiting to be fetched
+        self.seen_urls = set()
+        self.probed_forms = set()
+        self.probed_urls = set()
+        self.pages_fetched = 0
+        self.forms_seen = 0
+
+    def in_scope(self, url):
+        parts = urlsplit(url)
+        return (parts.scheme in DEFAULT_PORTS and parts.netloc in self.allowed_hosts
+                and parts.path.startswith(self.path_prefixes) and not parts.path.lower().endswith(STATIC_EXTENSIONS))
+
+    def enqueue(self, url, depth):
+        try:
+            url = canonicalize_url(url)
+        except ValueError:
+            return  # Malformed link, e.g. a port outside 0-65535
+        if depth <= self.max_depth and url not in self.seen_urls and self.in_scope(url):
+            self.seen_urls.add(url)
+            self.frontier.append((url, depth))
+
+    def summary(self):
+        return {"pages_fetched": self.pages_fetched, "forms_seen": self.forms_seen, "forms_probed": len(self.probed_forms),
+                "urls_probed": len(self.probed_urls)}
+
+    def crawl(self):
+        # Yields one record per failed page fetch and per probe, as soon as each is ready
+        for seed in self.seeds:
+            self.enqueue(seed, 0)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            pending = {}  # future -> (kind, url, depth or form details)
+            while self.frontier or pending:
+                # Pages are only taken off the frontier while there is room in flight and in the page budget
+                while self.frontier and len(pending) < 2 * self.max_in_flight and self.pages_fetched < self.max_pages:
+                    url, depth = self.frontier.popleft()
+                    self.pages_fetched += 1
+                    pending[executor.submit(_fetch_page, url, self.timeout)] = ("page", url, depth)
+                if not pending:
+                    break  # Page budget used up
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    kind, url, extra = pending.pop(future)
+                    try:
+                        outcome = future.result()
+                    except Exception as error:  # Network errors and pages that fail to parse are reported, not fatal
+                        yield {"kind": kind, "url": url, "error": f"{type(error).__name__}: {error}"}
+                        continue
+                    if kind == "page":
+                        final_url, links, forms = outcome
+                        if not self.in_scope(canonicalize_url(final_url)):
+                            continue  # Redirected out of scope: nothing on that page is followed or probed
+                        self.seen_urls.add(canonicalize_url(final_url))
+                        for link in links:
+                            self.enqueue(link, extra + 1)
+                        if urlsplit(url).query and url_fingerprint(url) not in self.probed_urls:
+                            self.probed_urls.add(url_fingerprint(url))
+                            pending[executor.submit(_probe_url_job, url, self.timeout)] = ("url", url, None)
+                        for form_details in forms:
+                            self.forms_seen += 1
+                            try:
+                                action_in_scope = self.in_scope(canonicalize_url(urljoin(final_url, form_details["action"])))
+                            except ValueError:
+                                action_in_scope = False  # Malformed action URL
+                            if not action_in_scope:
+                                continue  # Payloads are only ever sent to hosts in scope
+                            fingerprint = form_fingerprint(final_url, form_details)
+                            if fingerprint not in self.probed_forms:
+                                self.probed_forms.add(fingerprint)
+                                pending[executor.submit(_probe_form_job, final_url, form_details, self.timeout)] = ("form", final_url, form_details)
+                    else:
+                        record = {"kind": kind, "url": url, "vulnerable": outcome is not None}
+                        if outcome is not None:
+                            record["location"] = outcome
+                        if kind == "form":
+                            record["form"] = extra
+                        yield record
+
+# Local stand-in web app for testing the scanner without touching a real site.
+# /search echoes a MySQL syntax error when its query string contains a quote, /login serves a form whose POST has the
+# same bug, /safe has a form that never errors, and /slow takes `slow_seconds` to answer. /page/N are template pages that
+# all carry the same login and search forms and link to each other under different spellings, for exercising the crawler.
+class _StandInHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so connection reuse can be observed
+    slow_seconds = 2
+    template_pages = 40
+
+    def reply(self, body):
+        body = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def respond(self, query, injectable_paths):
+        path = urlparse(self.path).path
+        if path == "/slow":
+            time.sleep(self.slow_seconds)
+        if path in injectable_paths and ("'" in query or '"' in query):
+            return self.reply("<p>You have an error in your SQL syntax; check the manual</p>")
+        if path.startswith("/page/"):
+            number = int(path.rsplit("/", 1)[1] or 0)
+            links = "".join(f'<a href="/page/{(number + step) % self.template_pages}#top">next</a>'
+                            f'<a href="../page/./{(number + step) % self.template_pages}">same</a>' for step in (1, 2, 3))
+            links += f'<a href="/item?id={number}">item</a><a href="/logo.png">logo</a><a href="https://example.com/">elsewhere</a>'
+            forms = ('<form action="/login" method="post"><input name="user"><input name="password" type="password"></form>'
+                     '<form action="/search"><input name="q"><input type="submit" value="Search"></form>')
+            return self.reply(links + forms)
+        if path == "/login":
+            return self.reply('<form action="/login" method="post"><input name="user"><input name="password" type="password"></form>')
+        return self.reply('<form action="/safe" method="get"><input name="q"></form>')
+
+    def do_GET(self):
+        self.respond(unquote_plus(urlparse(self.path).query), ("/search",))
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.respond(unquote_plus(self.rfile.read(length).decode()), ("/login",))
+
+    def log_message(self, format, *args):
+        pass
+
+def serve_stand_in_site(host="127.0.0.1", port=0):
+    # Starts the stand-in app on a background thread and returns the server; its URL is http://host:server.server_port
+    server = http.server.ThreadingHTTPServer((host, port), _StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
 
 if __name__ == "__main__":
-    # Target URL for scanning
-    url = "https://www.lloydsbank.com/"
-    scan_sql_injection(url)
+    parser = argparse.ArgumentParser(description="Scan URLs for SQL injection.")
+    parser.add_argument("targets", nargs="*", help="URLs to scan (default: the bank's portal)")
+    parser.add_argument("--targets-file", help="File with one URL per line")
+    parser.add_argument("--max-in-flight", type=int, default=32, help="Requests outstanding at once")
+    parser.add_argument("--timeout", type=float, default=10, help="Seconds allowed for each request")
+    parser.add_argument("--target-timeout", type=float, default=60, help="Seconds allowed for all probes of one target")
+    parser.add_argument("--stand-in", action="store_true", help="Scan a local stand-in web app instead of real targets")
+    parser.add_argument("--crawl", action="store_true", help="Treat the targets as seeds and crawl them, probing each distinct form once")
+    parser.add_argument("--max-depth", type=int, default=2, help="Links followed away from the seeds when crawling")
+    parser.add_argument("--max-pages", type=int, default=500, help="Pages fetched at most when crawling")
+    args = parser.parse_args()
+
+    if args.stand_in:
+        server = serve_stand_in_site()
+        base = f"http://127.0.0.1:{server.server_port}"
+        if args.crawl:
+            targets = [f"{base}/page/0"]
+        else:
+            targets = [f"{base}/{page}?id={i}" for i in range(50) for page in ("search", "login", "safe")] + [f"{base}/slow"]
+    elif args.targets or args.targets_file:
+        targets = list(args.targets)
+        if args.targets_file:
+            with open(args.targets_file) as targets_file:
+                targets += [line.strip() for line in targets_file if line.strip()]
+    else:
+        # Target URL for scanning
+        url = "https://www.lloydsbank.com/"
+        scan_sql_injection(url)
+        targets = []
+
+    # Results are printed as JSON lines as soon as each target finishes
+    if args.crawl:
+        crawler = Crawler(targets, args.max_depth, args.max_pages, max_in_flight=args.max_in_flight, timeout=args.timeout)
+        for result in crawler.crawl():
+            print(json.dumps(result), flush=True)
+        print(json.dumps({"summary": crawler.summary()}))
+    else:
+        for result in scan_targets(targets, args.max_in_flight, args.timeout, args.target_timeout):
+            print(json.dumps(result), flush=True)